@@ -11,98 +11,292 @@ Environment variables can override stored values:
 
 from __future__ import annotations
 
-import json
 import os
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, ClassVar, Dict, Optional, Set, Tuple
+
+try:
+    # Optional C-accelerated JSON; stdlib json is used when unavailable
+    import orjson
+except Exception:  # pragma: no cover - the dependency may not be installed
+    orjson = None  # type: ignore
+
+_AZURE_ENV_VARS = ("AZURE_STORAGE_CONNECTION_STRING", "AZURE_STORAGE_CONTAINER", "AZURE_STORAGE_PREFIX")
+
+# Flat-table key: the path of dict keys from the root of config.json to a leaf. Tuples
+# rather than dotted strings, so user keys that contain "." survive a load/save round trip.
+_Key = Tuple[str, ...]
+
+# Expected value types for known keys. Checked when resolving, not on load, so a value
+# of the wrong type is ignored by readers but still written back unchanged by save().
+_SCHEMA: Dict[_Key, Tuple[type, ...]] = {
+    ("azure", "connection_string"): (str, type(None)),
+    ("azure", "container"): (str, type(None)),
+    ("azure", "default_prefix"): (str, type(None)),
+}
+
+# Config files at least this large are parsed from an mmap instead of a read()
+_MMAP_MIN_SIZE = 4096
+
+_DEFAULT_CONFIG_DIR: Optional[Path] = None
+
+
+def _default_config_dir() -> Path:
+    """Return ~/.gphoto_explorer, resolving the home directory only once."""
+    global _DEFAULT_CONFIG_DIR
+    if _DEFAULT_CONFIG_DIR is None:
+        _DEFAULT_CONFIG_DIR = Path.home() / ".gphoto_explorer"
+    return _DEFAULT_CONFIG_DIR
 
 
 class ConfigManager:
     """Simple JSON-backed configuration manager."""
 
-    def __init__(self, config_dir: Optional[Path] = None):
-        self.config_dir = config_dir or (Path.home() / ".gphoto_explorer")
-        self.config_file = self.config_dir / "config.json"
-        self._config: Dict[str, Any] = {
-            "azure": {
-                "connection_string": None,
-                "container": None,
-                "default_prefix": "",
-            }
+    __slots__ = (
+        "config_dir",
+        "config_file",
+        "_config_dir_str",
+        "_config_file_str",
+        "_config",
+        "_loaded",
+        "_dirty",
+        "_pending",
+        "_env_cache",
+        "_resolved",
+    )
+
+    # Flat-table keys for the azure settings read on every resolve
+    _K_CONN: ClassVar[_Key] = ("azure", "connection_string")
+    _K_CONT: ClassVar[_Key] = ("azure", "container")
+    _K_PREFIX: ClassVar[_Key] = ("azure", "default_prefix")
+
+    def __init__(self, config_dir: Optional[Path] = None) -> None:
+        self.config_dir: Path = config_dir or _default_config_dir()
+        self.config_file: Path = self.config_dir / "config.json"
+        # Plain string paths for load()/save(); avoids pathlib overhead per call
+        self._config_dir_str: str = str(self.config_dir)
+        self._config_file_str: str = str(self.config_file)
+        # Config is held as a flat {("section", "key"): value} table; the on-disk
+        # JSON stays nested for readability and is converted on load/save.
+        self._config: Dict[_Key, Any] = {
+            ("azure", "connection_string"): None,
+            ("azure", "container"): None,
+            ("azure", "default_prefix"): "",
         }
-        self._loaded = False
+        self._loaded: bool = False
+        # Set when an in-memory value changes; save() is a no-op otherwise
+        self._dirty: bool = False
+        # Keys set before the file was loaded; they win over on-disk values
+        self._pending: Set[_Key] = set()
+        # Environment lookups are cached per instance; cleared by set_azure_*
+        self._env_cache: Dict[str, Optional[str]] = {}
+        # Final env-or-config azure values, computed once and reset on changes
+        self._resolved: Optional[Dict[str, Any]] = None
+
+    def _env_snapshot(self) -> Dict[str, Optional[str]]:
+        """Read all azure environment overrides from os.environ in one pass."""
+        if not self._env_cache:
+            env = os.environ
+            self._env_cache = {name: env.get(name) for name in _AZURE_ENV_VARS}
+        return self._env_cache
+
+    @staticmethod
+    def _flatten(node: Dict[str, Any], prefix: _Key, out: Dict[_Key, Any]) -> None:
+        """Flatten nested dicts into key paths; empty dicts are kept as leaves."""
+        for key, child in node.items():
+            path = prefix + (key,)
+            if isinstance(child, dict) and child:
+                ConfigManager._flatten(child, path, out)
+            else:
+                out[path] = child
+
+    def _nested(self, prefix: _Key = ()) -> Dict[str, Any]:
+        """Rebuild the nested form of the flat table (optionally one subtree)."""
+        root: Dict[str, Any] = {}
+        depth = len(prefix)
+        for path, value in self._config.items():
+            if depth:
+                if len(path) <= depth or path[:depth] != prefix:
+                    continue
+                path = path[depth:]
+            node: Dict[str, Any] = root
+            for key in path[:-1]:
+                node = node.setdefault(key, {})
+            node[path[-1]] = value
+        return root
+
+    def _typed(self, key: _Key) -> Any:
+        """The table value for a _SCHEMA key, or None if it has the wrong type."""
+        value = self._config.get(key)
+        return value if isinstance(value, _SCHEMA[key]) else None
 
     def load(self) -> None:
         if self._loaded:
             return
+        self._resolved = None
         try:
-            if self.config_file.exists():
-                with open(self.config_file, "r") as f:
-                    data = json.load(f)
-                    if isinstance(data, dict):
-                        self._config.update(data)
+            if os.path.exists(self._config_file_str):
+                data: Any
+                with open(self._config_file_str, "rb") as f:
+                    size = os.fstat(f.fileno()).st_size
+                    if orjson is not None and size >= _MMAP_MIN_SIZE:
+                        import mmap
+
+                        # Parse straight from the mapped pages without a bytes copy
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            with memoryview(mm) as view:
+                                data = orjson.loads(view)
+                    elif orjson is not None:
+                        data = orjson.loads(f.read())
+                    else:
+                        import json
+
+                        data = json.loads(f.read())
+                if isinstance(data, dict):
+                    loaded: Dict[_Key, Any] = {}
+                    self._flatten(data, (), loaded)
+                    for key, value in loaded.items():
+                        if not self._overridden(key):
+                            self._merge_loaded(key, value)
         except Exception:
             # Ignore config load errors; use defaults
             pass
         finally:
             self._loaded = True
+            self._pending.clear()
+
+    def _merge_loaded(self, path: _Key, value: Any) -> None:
+        """Merge one on-disk leaf, keeping the flat table a consistent tree.
+
+        A leaf where the table already holds a subtree (e.g. "azure": null or
+        "azure": {}) is dropped so it cannot shadow the known azure.* keys on
+        save. A leaf below an existing leaf replaces that leaf, as in _set_key.
+        """
+        config = self._config
+        depth = len(path)
+        if any(len(key) > depth and key[:depth] == path for key in config):
+            return
+        for idx in range(1, depth):
+            config.pop(path[:idx], None)
+        config[path] = value
+
+    def _overridden(self, key: _Key) -> bool:
+        """True if a pending set() covers this key, a parent, or a child of it."""
+        for pending in self._pending:
+            # One path is a prefix of the other (or they are equal)
+            shorter = min(len(key), len(pending))
+            if key[:shorter] == pending[:shorter]:
+                return True
+        return False
 
     def save(self) -> None:
-        self.load()
-        self.config_dir.mkdir(parents=True, exist_ok=True)
-        with open(self.config_file, "w") as f:
-            json.dump(self._config, f, indent=2)
+        if not self._dirty:
+            return
+        # Merge with what is on disk so unrelated keys are preserved
+        if not self._loaded:
+            self.load()
+        os.makedirs(self._config_dir_str, exist_ok=True)
+        nested = self._nested()
+        if orjson is not None:
+            payload: bytes = orjson.dumps(nested, option=orjson.OPT_INDENT_2)
+        else:
+            import json
+
+            payload = json.dumps(nested, indent=2).encode("utf-8")
+        # One write of the serialized buffer to a private temp file, then an
+        # atomic rename; the file holds a connection string, so keep it 0600.
+        tmp_path = self._config_file_str + ".tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view) :]
+        finally:
+            os.close(fd)
+        os.replace(tmp_path, self._config_file_str)
+        self._dirty = False
 
     # Generic getters/setters
     def get(self, *keys: str, default: Any = None) -> Any:
         self.load()
-        node: Any = self._config
-        for key in keys:
-            if not isinstance(node, dict) or key not in node:
-                return default
-            node = node[key]
-        return node
+        try:
+            return self._config[keys]
+        except KeyError:
+            pass
+        # Not a leaf: return the subtree rooted at these keys, if any
+        subtree = self._nested(keys)
+        return subtree or default
 
     def set(self, value: Any, *keys: str) -> None:
-        self.load()
-        node: Dict[str, Any] = self._config
-        for key in keys[:-1]:
-            if key not in node or not isinstance(node[key], dict):
-                node[key] = {}
-            node = node[key]  # type: ignore[assignment]
-        node[keys[-1]] = value
+        self._set_key(keys, value)
+
+    def _set_key(self, path: _Key, value: Any) -> None:
+        # No load() here: an overwrite does not need the on-disk value, and
+        # save() merges the file in before writing.
+        config = self._config
+        if path in config:
+            # Existing leaf: nothing above or below it can exist in the table
+            if self._loaded and config[path] == value:
+                return
+        else:
+            # Setting a new leaf replaces any subtree below it and any leaf above it
+            depth = len(path)
+            for existing in [k for k in config if len(k) > depth and k[:depth] == path]:
+                del config[existing]
+            for idx in range(1, depth):
+                config.pop(path[:idx], None)
+        if not self._loaded:
+            self._pending.add(path)
+        config[path] = value
+        self._dirty = True
+        self._resolved = None
 
     # Azure-specific helpers
+    def _resolve(self) -> Dict[str, Any]:
+        """Resolve azure settings (environment first, then config) once."""
+        if self._resolved is not None:
+            return self._resolved
+        self.load()
+
+        env = self._env_snapshot()
+        conn = env["AZURE_STORAGE_CONNECTION_STRING"] or self._typed(self._K_CONN)
+        container = env["AZURE_STORAGE_CONTAINER"] or self._typed(self._K_CONT)
+        prefix = env["AZURE_STORAGE_PREFIX"]
+        if prefix is None:
+            prefix = self._typed(self._K_PREFIX) or ""
+
+        self._resolved = {"conn": conn, "container": container, "prefix": prefix}
+        return self._resolved
+
     def get_azure_connection_string(self) -> Optional[str]:
-        env_val = os.getenv("AZURE_STORAGE_CONNECTION_STRING")
-        if env_val:
-            return env_val
-        return self.get("azure", "connection_string")
+        return self._resolve()["conn"]
 
     def set_azure_connection_string(self, connection_string: str) -> None:
-        self.set(connection_string, "azure", "connection_string")
+        self._set_key(self._K_CONN, connection_string)
+        self._env_cache.clear()
         self.save()
 
     def get_azure_container(self) -> Optional[str]:
-        env_val = os.getenv("AZURE_STORAGE_CONTAINER")
-        if env_val:
-            return env_val
-        return self.get("azure", "container")
+        return self._resolve()["container"]
 
     def set_azure_container(self, container: str) -> None:
-        self.set(container, "azure", "container")
+        self._set_key(self._K_CONT, container)
+        self._env_cache.clear()
         self.save()
 
     def get_azure_default_prefix(self) -> str:
-        env_val = os.getenv("AZURE_STORAGE_PREFIX")
-        if env_val is not None:
-            return env_val
-        return self.get("azure", "default_prefix", default="") or ""
+        return self._resolve()["prefix"]
 
     def set_azure_default_prefix(self, prefix: str) -> None:
-        self.set(prefix, "azure", "default_prefix")
+        self._set_key(self._K_PREFIX, prefix)
+        self._env_cache.clear()
         self.save()
 
     # Convenience
+    def azure_dict(self) -> Dict[str, Any]:
+        """Return resolved azure settings as {"conn", "container", "prefix"} in one lookup."""
+        return dict(self._resolve())
+
     def azure_is_configured(self) -> bool:
-        return bool(self.get_azure_connection_string() and self.get_azure_container())
+        resolved = self._resolve()
+        return bool(resolved["conn"] and resolved["container"])
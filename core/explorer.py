@@ -1,27 +1,535 @@
 """Core Google Photos Explorer functionality."""
 
+import hashlib
+import io
 import json
 import os
 import re
+import shutil
+import sys
+import tempfile
+import threading
 import zipfile
-from collections import defaultdict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from array import array
+from collections import OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import IO, Any, Callable, DefaultDict, Dict, Iterator, List, Literal, Optional, Pattern, Tuple, Union
+
+from .config import ConfigManager, _default_config_dir
+from .thumbnail import generate_thumbnail_stream
+from .upload import (
+    _CONTENT_TYPES,
+    UPLOAD_CONCURRENCY,
+    UploadTarget,
+    build_provider,
+    join_blob_path,
+    sanitize_blob_path,
+)
+
+try:
+    # Optional C-accelerated JSON parser; stdlib json is used when unavailable
+    import orjson
+except Exception:  # pragma: no cover - the dependency may not be installed
+    orjson = None  # type: ignore
+
+IMAGE_EXTS = frozenset({".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"})
+VIDEO_EXTS = frozenset({".mp4", ".mov", ".avi", ".wmv", ".m4v", ".mpg", ".mpeg"})
+MEDIA_EXTS = IMAGE_EXTS | VIDEO_EXTS
+
+# Known extensions as spelled in zips (lower or upper case) -> one interned lowercase
+# string, so hot loops skip .lower() for the common spellings and test sets by identity
+_KNOWN_EXTS = tuple(sys.intern(e) for e in sorted(MEDIA_EXTS | {".json"}))
+_EXT_TABLE: Dict[str, str] = {**{e: e for e in _KNOWN_EXTS}, **{e.upper(): e for e in _KNOWN_EXTS}}
+
+# Extension spelling -> explore_zip bucket (0 images, 1 videos, 2 json; anything else is 3, other)
+_EXT_BUCKET: Dict[str, int] = {
+    spelling: 0 if ext in IMAGE_EXTS else 1 if ext in VIDEO_EXTS else 2 for spelling, ext in _EXT_TABLE.items()
+}
+
+# Lowercase extension -> (_EXT_BUCKET column, content type): one lookup per uploaded file
+_EXT_KIND: Dict[str, Tuple[int, Optional[str]]] = {
+    ext: (_EXT_BUCKET[ext], _CONTENT_TYPES.get(ext)) for ext in _KNOWN_EXTS
+}
+_OTHER_KIND: Tuple[int, Optional[str]] = (3, None)
+
+# Sort key for (zip_path, file_path) pairs: deterministic tiebreak by archive path
+_BY_PATH = itemgetter(1)
+# Sort key for (header_offset, ...) tuples: archive order on disk
+_BY_OFFSET = itemgetter(0)
+
+# Column order of the per-folder count rows kept in the catalog (matches _EXT_BUCKET)
+_FOLDER_COLUMNS = ("images", "videos", "json", "other")
+
+# Album-level sidecar naming: "<photo name>.supplemental-metadata.json"
+_SUPPLEMENTAL_SUFFIX = ".supplemental-metadata.json"
+
+# Uploaded manifests stay in memory up to this size, then spill to a temp file
+_MANIFEST_SPOOL_SIZE = 8 * 1024 * 1024
+
+# Thumbnail resizes run beside the uploads; Pillow's decoder and resampler release the GIL
+_THUMBNAIL_WORKERS = os.cpu_count() or 1
+
+# Bump whenever the persisted catalog layout changes; older cache files are ignored
+_CATALOG_CACHE_VERSION = 11
+
+
+def _load_json(zf: zipfile.ZipFile, member: Any) -> Any:
+    """Read a JSON member (name or ZipInfo) in one call and parse it.
+
+    Sidecars are small, so a single read() beats streaming through ZipExtFile.
+    """
+    return _parse_json(zf.read(member))
+
+
+def _parse_json(data: bytes) -> Any:
+    """Parse JSON bytes with orjson when available, else stdlib json."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass  # stdlib json is more lenient (e.g. NaN); let it decide
+    return json.loads(data)
+
+
+def _dumps_indented(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON with 2-space indents (orjson when available).
+
+    Values orjson rejects (e.g. integers beyond 64 bits) go through stdlib json.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+        except TypeError:  # orjson.JSONEncodeError
+            pass
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def _taken_timestamp(meta: Any) -> Optional[int]:
+    """photoTakenTime (else creationTime) timestamp of a parsed sidecar, if any."""
+    try:
+        ts = None
+        if isinstance(meta, dict):
+            if "photoTakenTime" in meta and isinstance(meta["photoTakenTime"], dict):
+                ts = meta["photoTakenTime"].get("timestamp")
+            if not ts and "creationTime" in meta and isinstance(meta["creationTime"], dict):
+                ts = meta["creationTime"].get("timestamp")
+        return int(ts) if ts else None
+    except Exception:
+        return None
+
+
+def _read_zip_infolist(zip_path: Path) -> List[zipfile.ZipInfo]:
+    """Parse one zip's central directory (module-level so process pools can pickle it)."""
+    with zipfile.ZipFile(zip_path, "r") as zf:
+        return zf.infolist()
+
+
+def _info_record(zi: zipfile.ZipInfo) -> List[Any]:
+    """The ZipInfo fields the catalog cache stores; a zip's catalog part is rebuilt from them."""
+    return [
+        zi.orig_filename,
+        list(zi.date_time),
+        zi.header_offset,
+        zi.compress_type,
+        zi.compress_size,
+        zi.file_size,
+        zi.CRC,
+        zi.flag_bits,
+        zi.external_attr,
+    ]
+
+
+def _info_from_record(record: List[Any]) -> zipfile.ZipInfo:
+    """Rebuild a ZipInfo from _info_record() output; enough for ZipFile.read/open of the member."""
+    orig_filename, date_time, header_offset, compress_type, compress_size, file_size, crc, flag_bits, attr = record
+    zi = zipfile.ZipInfo(orig_filename, tuple(date_time))
+    zi.header_offset = header_offset
+    zi.compress_type = compress_type
+    zi.compress_size = compress_size
+    zi.file_size = file_size
+    zi.CRC = crc
+    zi.flag_bits = flag_bits
+    zi.external_attr = attr
+    return zi
+
+
+def _compile_pattern(pattern: Union[str, Pattern[str]]) -> Pattern[str]:
+    """Compile a user file-name pattern case-insensitively; an already compiled one is used as-is."""
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _name_and_ext(file_name: str) -> Tuple[str, str]:
+    """Basename and lowercase suffix of an archive path, matching Path(...).name / .suffix.lower()."""
+    base = file_name[file_name.rfind("/") + 1 :]
+    dot = base.rfind(".")
+    if not 0 < dot < len(base) - 1:
+        return base, ""
+    raw_ext = base[dot:]
+    ext = _EXT_TABLE.get(raw_ext)
+    return base, ext if ext is not None else raw_ext.lower()
+
+
+def _ext_column(name: str) -> int:
+    """_EXT_BUCKET column for a file name (0 images, 1 videos, 2 json, 3 other)."""
+    dot = name.rfind(".")
+    if dot <= 0:
+        return 3
+    raw_ext = name[dot:]
+    col = _EXT_BUCKET.get(raw_ext)
+    if col is None:
+        col = _EXT_BUCKET.get(raw_ext.lower(), 3)
+    return col
+
+
+def _classify_zip(zip_path: Path, infos: List[zipfile.ZipInfo]) -> Dict[str, Any]:
+    """Classify one zip's entries into its share of the catalog.
+
+    A pure function of its arguments so it can run in a pool worker; the
+    per-zip parts are merged in zip order by GooglePhotosExplorer._ensure_catalog.
+    """
+    media_exts = MEDIA_EXTS
+    ext_table = _EXT_TABLE
+    ext_bucket = _EXT_BUCKET
+    album_prefix = "Takeout/Google Photos/"
+    album_prefix_len = len(album_prefix)
+    supplemental_suffix = _SUPPLEMENTAL_SUFFIX
+    supplemental_suffix_len = len(_SUPPLEMENTAL_SUFFIX)
+
+    names = [zi.filename for zi in infos]
+    zip_folder_stats: Dict[str, List[int]] = {}
+    media: DefaultDict[str, List[Tuple[Path, str]]] = defaultdict(list)
+    albums: Dict[str, Album] = {}
+
+    for file_name in names:
+        # Plain string ops: this loop runs for every entry of every zip
+        slash = file_name.rfind("/")
+        base = file_name[slash + 1 :]
+        dot = base.rfind(".")
+        # Only known extensions matter below; anything else maps to ""
+        raw_ext = base[dot:] if dot > 0 else ""
+        ext = ext_table.get(raw_ext)
+        if ext is None:
+            ext = ext_table.get(raw_ext.lower(), "")
+        is_media = ext in media_exts
+
+        # Per-folder counts; directory entries ("a/b/") count toward their parent
+        if base:
+            folder = file_name[:slash] if slash > 0 else ""
+            folder_col = ext_bucket.get(ext, 3)
+        else:
+            dir_name = file_name[:-1]
+            dir_slash = dir_name.rfind("/")
+            folder = dir_name[:dir_slash] if dir_slash > 0 else ""
+            dir_base = dir_name[dir_slash + 1 :]
+            dir_dot = dir_base.rfind(".")
+            folder_col = ext_bucket.get(dir_base[dir_dot:].lower(), 3) if dir_dot > 0 else 3
+        if folder:
+            row = zip_folder_stats.get(folder)
+            if row is None:
+                row = zip_folder_stats[folder] = [0, 0, 0, 0]
+            row[folder_col] += 1
+
+        # Index global media by basename
+        if is_media:
+            media[base].append((zip_path, file_name))
+
+        # Index by album: "Takeout/Google Photos/<album>/..."
+        if file_name.startswith(album_prefix):
+            next_slash = file_name.find("/", album_prefix_len)
+            if next_slash <= album_prefix_len:
+                continue  # loose file at the Google Photos root, not inside an album
+            album_name = file_name[album_prefix_len:next_slash]
+            album = albums.get(album_name)
+            if album is None:
+                album = albums[album_name] = Album([], [], [], None, {}, 0, 0)
+            album.files.append((zip_path, file_name))
+
+            if base == "metadata.json":
+                album.info_file = (zip_path, file_name)
+
+            if is_media:
+                album.direct_media.append((zip_path, file_name))
+                album.direct_names.append(base)
+
+            if base.endswith(supplemental_suffix):
+                photo_name = base[:-supplemental_suffix_len]
+                # Prefer first seen mapping; do not overwrite if duplicates
+                if photo_name not in album.supplemental_map:
+                    album.supplemental_map[photo_name] = (zip_path, file_name)
+                    photo_col = _ext_column(photo_name)
+                    if photo_col == 0:
+                        album.supp_img_count += 1
+                    elif photo_col == 1:
+                        album.supp_vid_count += 1
+
+    media.default_factory = None
+    return {
+        "zip_path": zip_path,
+        "infos": infos,
+        "names": names,
+        "info_map": {zi.filename: zi for zi in infos},
+        "json_names": [name for name in names if name.endswith(".json")],
+        # Case-insensitive, as upload_by_pattern excludes sidecars without include_metadata
+        "non_json_names": [name for name in names if name[-5:].lower() != ".json"],
+        "folder_stats": zip_folder_stats,
+        "media": media,
+        "albums": albums,
+    }
+
+
+def _scan_zip(zip_path: Path) -> Dict[str, Any]:
+    """Read and classify one zip (module-level so process pools can pickle it)."""
+    return _classify_zip(zip_path, _read_zip_infolist(zip_path))
+
+
+# Read buffer of cached ZipFile handles; members are read in archive order (see _archive_order)
+_ZIP_READ_BUFFER = 1024 * 1024
+
+
+class _ForwardOnlyReader:
+    """Non-seekable view of a zip member for upload_stream.
+
+    ZipExtFile reports seekable(), so the storage SDK would have each block thread
+    seek to its own offset; a backward seek there restarts decompression from the
+    start of the member. Hiding seek makes the SDK read the member once, in order.
+    """
+
+    __slots__ = ("_stream",)
+
+    def __init__(self, stream: IO[bytes]) -> None:
+        self._stream = stream
+
+    def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return False
+
 
-from .config import ConfigManager
-from .thumbnail import generate_thumbnail
-from .upload import UploadTarget, build_provider, detect_content_type, sanitize_blob_path
+class _BufferedZipFile(zipfile.ZipFile):
+    """ZipFile over its own large-buffer reader, closed together with the archive."""
+
+    def __init__(self, zip_path: Path) -> None:
+        self._reader = open(zip_path, "rb", buffering=_ZIP_READ_BUFFER)
+        try:
+            super().__init__(self._reader, "r")
+        except BaseException:
+            self._reader.close()
+            raise
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            self._reader.close()
+
+
+def _max_cached_zips() -> int:
+    """Cap on cached open ZipFile handles: a quarter of the open-file soft limit."""
+    try:
+        import resource
+
+        soft, _hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft == resource.RLIM_INFINITY or soft <= 0:
+            soft = 1024
+    except Exception:  # pragma: no cover - no resource module (Windows)
+        soft = 512  # default C runtime stdio limit
+    return max(1, soft // 4)
+
+
+@dataclass
+class Album:
+    """Catalog entry for one album folder under Takeout/Google Photos/."""
+
+    __slots__ = (
+        "files",
+        "direct_media",
+        "direct_names",
+        "info_file",
+        "supplemental_map",
+        "supp_img_count",
+        "supp_vid_count",
+    )
+
+    files: List[Tuple[Path, str]]  # every entry in the album folder
+    direct_media: List[Tuple[Path, str]]  # media stored in the folder itself
+    direct_names: List[str]  # basename of each direct_media entry, in the same order
+    info_file: Optional[Tuple[Path, str]]  # the album's metadata.json
+    supplemental_map: Dict[str, Tuple[Path, str]]  # photo_name -> (zip_path, json_path)
+    supp_img_count: int  # supplemental_map keys that name an image
+    supp_vid_count: int  # supplemental_map keys that name a video
+
+
+@dataclass
+class _UploadJob:
+    """One archive member to upload, with its destinations and kind worked out up front."""
+
+    __slots__ = (
+        "zip_path",
+        "archive_path",
+        "name",
+        "ext",
+        "dest",
+        "thumb_dest",
+        "content_type",
+        "is_image",
+        "is_media",
+    )
+
+    zip_path: Path
+    archive_path: str
+    name: str  # basename of archive_path
+    ext: str  # lowercase suffix of name
+    dest: str  # sanitized destination of the original
+    thumb_dest: Optional[str]  # sanitized "thumb-<name>" beside dest; None when no thumbnail is wanted
+    content_type: Optional[str]
+    is_image: bool
+    is_media: bool
+
+
+def _upload_job(
+    zip_path: Path, archive_path: str, dest_relative: str, dest_prefix: str, thumbnails: bool = False
+) -> _UploadJob:
+    """Build the _UploadJob that uploads archive_path to dest_prefix/dest_relative.
+
+    dest_prefix is already sanitized (once per call site); only dest_relative is sanitized here.
+    """
+    name, ext = _name_and_ext(archive_path)
+    column, content_type = _EXT_KIND.get(ext, _OTHER_KIND)
+    thumb_dest: Optional[str] = None
+    if thumbnails and column == 0:
+        dest_dir = dest_relative[: dest_relative.rfind("/") + 1]
+        thumb_dest = join_blob_path(dest_prefix, f"{dest_dir}thumb-{name}")
+    return _UploadJob(
+        zip_path,
+        archive_path,
+        name,
+        ext,
+        join_blob_path(dest_prefix, dest_relative),
+        thumb_dest,
+        content_type,
+        column == 0,
+        column < 2,
+    )
+
+
+class _ManifestWriter:
+    """Write an album manifest.json one entry at a time.
+
+    Produces the same document as _dumps_indented({"album": ..., "entries": [...]})
+    without holding the entries in memory. Written to a temp file and renamed
+    on close; write errors are non-fatal and drop the manifest. With path=None
+    the document goes to a spool instead, handed out by finish() for upload.
+    """
+
+    def __init__(self, path: Optional[Path], album_name: str) -> None:
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp") if path is not None else None
+        self.count = 0
+        self._file: Optional[Any] = None
+        self._finished = False
+        try:
+            if self.tmp_path is not None:
+                self._file = open(self.tmp_path, "wb")
+            else:
+                self._file = tempfile.SpooledTemporaryFile(max_size=_MANIFEST_SPOOL_SIZE)
+            self._file.write(b'{\n  "album": ' + _dumps_indented(album_name) + b',\n  "entries": [')
+        except Exception:
+            self._abort()
+
+    def write_entry(self, entry: Dict[str, Any]) -> None:
+        if self._file is None or self._finished:
+            return
+        try:
+            body = _dumps_indented(entry).replace(b"\n", b"\n    ")
+            self._file.write((b"\n    " if not self.count else b",\n    ") + body)
+            self.count += 1
+        except Exception:
+            self._abort()
+
+    def finish(self) -> Optional[IO[bytes]]:
+        """Complete a spooled manifest and return it for reading; None if writing failed.
+
+        The stream stays valid until close().
+        """
+        if self._file is None or self.tmp_path is not None:
+            return None
+        if not self._finished:
+            try:
+                self._file.write(b"\n  ]\n}" if self.count else b"]\n}")
+            except Exception:
+                self._abort()
+                return None
+            self._finished = True
+        return self._file
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        if self.tmp_path is None:
+            # Spooled manifest: nothing to keep once the caller is done with it
+            self._abort()
+            return
+        try:
+            self._file.write(b"\n  ]\n}" if self.count else b"]\n}")
+            self._file.close()
+            self._file = None
+            os.replace(self.tmp_path, self.path)
+        except Exception:
+            self._abort()
+
+    def _abort(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.close()
+            except Exception:
+                pass
+            self._file = None
+        if self.tmp_path is None:
+            return
+        try:
+            os.unlink(self.tmp_path)
+        except OSError:
+            pass
 
 
 class GooglePhotosExplorer:
     """Core class for exploring Google Photos Takeout zip files."""
 
-    def __init__(self, zip_directory: str, preload_catalog: bool = False, catalog_progress_callback=None):
+    def __init__(
+        self,
+        zip_directory: str,
+        preload_catalog: bool = False,
+        catalog_progress_callback=None,
+        persist_catalog: bool = True,
+        config: Optional[ConfigManager] = None,
+    ):
         self.zip_directory = Path(zip_directory)
         self.zip_files = self._find_zip_files()
         self._cache = {}
+        # Used for uploads and for the catalog cache location; a fresh default one if None
+        self._config = config
+        # Reuse zip listings across runs from <config dir>/cache when zips are unchanged
+        self.persist_catalog = persist_catalog
+        # Open ZipFile handles reused across calls (LRU, bounded by fd limit)
+        self._zf_cache: "OrderedDict[Path, zipfile.ZipFile]" = OrderedDict()
+        self._zf_users: Dict[int, int] = {}  # id(handle) -> active borrowers
+        self._zf_lock = threading.Lock()
+        self._zf_limit = _max_cached_zips()
+        # Created on the first upload that wants thumbnails; shut down by close()
+        self._thumb_pool: Optional[ThreadPoolExecutor] = None
+        self._thumb_pool_lock = threading.Lock()  # uploads may run from several threads
         if preload_catalog:
             # Eagerly build the album/media catalog to avoid first-call latency
             self._ensure_catalog(progress_callback=catalog_progress_callback)
@@ -31,6 +539,8 @@ class GooglePhotosExplorer:
         worker: Callable[[Path], Any],
         progress_callback=None,
         max_workers: Optional[int] = None,
+        zip_paths: Optional[List[Path]] = None,
+        backend: Literal["thread", "process"] = "thread",
     ) -> List[Tuple[Path, Any]]:
         """Run a worker over all zip files in parallel.
 
@@ -38,20 +548,30 @@ class GooglePhotosExplorer:
             worker: Function taking a Path to a zip and returning a result.
             progress_callback: Optional callback (completed, total)
             max_workers: Optional cap for the pool size
+            zip_paths: Optional subset of zips to process (defaults to all)
+            backend: "thread" for I/O-bound work; "process" for GIL-bound parsing
+                (the worker must then be a picklable module-level function)
 
         Returns:
             List of (zip_path, result) ordered by original zip order.
         """
-        total = len(self.zip_files)
+        if zip_paths is None:
+            zip_paths = self.zip_files
+        total = len(zip_paths)
         if total == 0:
             return []
 
-        pool_size = max_workers or min(32, (os.cpu_count() or 4) * 2, total)
+        if backend == "process":
+            pool_size = max_workers or min(os.cpu_count() or 1, total)
+            executor_cls: Any = ProcessPoolExecutor
+        else:
+            pool_size = max_workers or min(32, (os.cpu_count() or 4) * 2, total)
+            executor_cls = ThreadPoolExecutor
         collected: List[Tuple[int, Path, Any]] = []
 
-        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+        with executor_cls(max_workers=pool_size) as executor:
             future_to_info = {}
-            for idx, zip_path in enumerate(self.zip_files, 1):
+            for idx, zip_path in enumerate(zip_paths, 1):
                 fut = executor.submit(worker, zip_path)
                 future_to_info[fut] = (idx, zip_path)
 
@@ -68,6 +588,75 @@ class GooglePhotosExplorer:
         ordered = [(zp, res) for (idx, zp, res) in sorted(collected, key=lambda t: t[0])]
         return ordered
 
+    @contextmanager
+    def _get_zip(self, zip_path: Path) -> Iterator[zipfile.ZipFile]:
+        """Borrow a cached ZipFile handle for zip_path, opening it on first use.
+
+        The central directory is parsed once per zip instead of on every open.
+        Handles evicted while still borrowed are closed when released.
+        """
+        with self._zf_lock:
+            zf = self._zf_cache.get(zip_path)
+            if zf is not None:
+                self._zf_cache.move_to_end(zip_path)
+                self._zf_users[id(zf)] = self._zf_users.get(id(zf), 0) + 1
+        if zf is None:
+            # Open outside the lock so different zips can be parsed concurrently
+            opened = _BufferedZipFile(zip_path)
+            with self._zf_lock:
+                zf = self._zf_cache.get(zip_path)
+                if zf is None:
+                    zf = opened
+                    self._zf_cache[zip_path] = zf
+                    self._evict_zips_locked()
+                self._zf_users[id(zf)] = self._zf_users.get(id(zf), 0) + 1
+            if zf is not opened:
+                opened.close()
+        try:
+            yield zf
+        finally:
+            with self._zf_lock:
+                remaining = self._zf_users[id(zf)] - 1
+                if remaining:
+                    self._zf_users[id(zf)] = remaining
+                else:
+                    del self._zf_users[id(zf)]
+                    if self._zf_cache.get(zip_path) is not zf:
+                        zf.close()
+
+    def _evict_zips_locked(self) -> None:
+        while len(self._zf_cache) > self._zf_limit:
+            _old_path, old_zf = self._zf_cache.popitem(last=False)
+            if id(old_zf) not in self._zf_users:
+                old_zf.close()
+
+    def close_zip_handles(self) -> None:
+        """Public API: close all cached zip handles (borrowed ones close on release)."""
+        with self._zf_lock:
+            handles = list(self._zf_cache.values())
+            self._zf_cache.clear()
+            for zf in handles:
+                if id(zf) not in self._zf_users:
+                    zf.close()
+
+    def close(self) -> None:
+        """Public API: release cached zip handles and worker threads; the explorer stays usable."""
+        self.close_zip_handles()
+        pool, self._thumb_pool = self._thumb_pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+
+    def __enter__(self) -> "GooglePhotosExplorer":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def _read_member(self, zip_path: Path, info: zipfile.ZipInfo) -> bytes:
+        """Read a member's bytes through the borrowed, cached ZipFile handle."""
+        with self._get_zip(zip_path) as zf:
+            return zf.read(info)
+
     def _find_zip_files(self) -> List[Path]:
         """Find all zip files in the specified directory."""
         if not self.zip_directory.exists():
@@ -85,73 +674,191 @@ class GooglePhotosExplorer:
         Catalog structure:
             {
               "by_zip": { Path(zip): [file_name, ...] },
-              "by_album": {
-                  album_name: {
-                      "files": [(zip_path, file_path), ...],
-                      "direct_media": [(zip_path, file_path), ...],
-                      "info_file": Optional[(zip_path, file_path)],
-                      "supplemental_map": { photo_name: (zip_path, json_path) }
-                  },
-              },
-              "media_by_basename": { basename: [(zip_path, file_path), ...] }
+              "by_zip_info": { Path(zip): { file_name: ZipInfo } },
+              "by_zip_json": { Path(zip): [json_file_name, ...] },
+              "by_zip_non_json": { Path(zip): [file_name not ending in .json/.JSON, ...] },
+              "by_album": { album_name: Album },
+              "media_by_basename": { basename: [(zip_path, file_path), ...] },
+              "folder_stats_by_zip": {
+                  Path(zip): { folder: [images, videos, json, other] }  # see _FOLDER_COLUMNS
+              }
             }
         """
         if not force_refresh and "album_catalog" in self._cache:
             return self._cache["album_catalog"]
 
-        image_exts = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"}
-        video_exts = {".mp4", ".mov", ".avi", ".wmv", ".m4v", ".mpg", ".mpeg"}
-
         by_zip: Dict[Path, List[str]] = {}
-        by_album: Dict[str, Dict[str, Any]] = {}
-        media_by_basename: Dict[str, List[Tuple[Path, str]]] = {}
-
-        def worker(zp: Path) -> List[str]:
-            with zipfile.ZipFile(zp, "r") as zf:
-                return zf.namelist()
-
-        for zip_path, names in self._map_zips_parallel(worker, progress_callback=progress_callback):
-            by_zip[zip_path] = names
-            for file_name in names:
-                p = Path(file_name)
-                base = p.name
-                ext = p.suffix.lower()
-
-                # Index global media by basename
-                if ext in image_exts or ext in video_exts:
-                    media_by_basename.setdefault(base, []).append((zip_path, file_name))
-
-                # Index by album
-                parts = file_name.split("/")
-                if len(parts) >= 3 and parts[0] == "Takeout" and parts[1] == "Google Photos":
-                    album_name = parts[2]
-                    album = by_album.setdefault(
-                        album_name,
-                        {
-                            "files": [],
-                            "direct_media": [],
-                            "info_file": None,
-                            "supplemental_map": {},  # photo_name -> (zip_path, json_path)
-                        },
+        by_zip_info: Dict[Path, Dict[str, zipfile.ZipInfo]] = {}
+        by_zip_json: Dict[Path, List[str]] = {}
+        by_zip_non_json: Dict[Path, List[str]] = {}
+        by_album: Dict[str, Album] = {}
+        media_by_basename: DefaultDict[str, List[Tuple[Path, str]]] = defaultdict(list)
+        folder_stats_by_zip: Dict[Path, Dict[str, List[int]]] = {}
+
+        if force_refresh:
+            self.close_zip_handles()
+
+        total = len(self.zip_files)
+        fingerprints = self._zip_fingerprints() if self.persist_catalog else None
+        if fingerprints is not None:
+            # Kept for total_zip_size(), which then needs no stat calls of its own
+            self._cache["zip_fingerprints"] = fingerprints
+        cached = self._load_catalog_cache() if fingerprints is not None and not force_refresh else None
+        zip_file_names = [str(zp) for zp in self.zip_files]
+
+        # Unchanged zips are classified from their stored listings instead of re-reading
+        # the central directory; only changed ones are opened
+        reused: Dict[str, Dict[str, Any]] = {}
+        if cached is not None:
+            old_fingerprints = cached["fingerprints"]
+            old_infos = cached["infos"]
+            for zp in self.zip_files:
+                infos = old_infos.get(zp.name)
+                if infos is not None and old_fingerprints.get(zp.name) == fingerprints[zp.name]:
+                    reused[zp.name] = _classify_zip(zp, infos)
+        if progress_callback and reused:
+            progress_callback(len(reused), total)
+
+        def read_progress(completed: int, _read_total: int) -> None:
+            progress_callback(len(reused) + completed, total)
+
+        to_read = [zp for zp in self.zip_files if zp.name not in reused]
+        read_kwargs = {"progress_callback": read_progress if progress_callback else None, "zip_paths": to_read}
+        read_parts: Dict[Path, Dict[str, Any]] = {}
+        if len(to_read) > 1:
+            # Central directory parsing and classification are pure Python under
+            # the GIL, so spread them over processes
+            try:
+                read_parts = dict(self._map_zips_parallel(_scan_zip, backend="process", **read_kwargs))
+            except (OSError, NotImplementedError, BrokenProcessPool):
+                # No usable process pool here (sandbox, frozen app); use threads. Worker
+                # errors such as a corrupt zip propagate instead of triggering a rescan.
+                read_parts = {}
+        if len(read_parts) != len(to_read):
+            read_parts = dict(self._map_zips_parallel(_scan_zip, **read_kwargs))
+        parts: List[Tuple[Path, Dict[str, Any]]] = [
+            (zp, reused[zp.name] if zp.name in reused else read_parts[zp]) for zp in self.zip_files
+        ]
+
+        # Merge the per-zip parts in zip order; parts are copied, not mutated, so
+        # they stay reusable from the cache
+        for zip_path, part in parts:
+            by_zip[zip_path] = part["names"]
+            by_zip_info[zip_path] = part["info_map"]
+            by_zip_json[zip_path] = part["json_names"]
+            by_zip_non_json[zip_path] = part["non_json_names"]
+            folder_stats_by_zip[zip_path] = part["folder_stats"]
+            for base, entries in part["media"].items():
+                media_by_basename[base].extend(entries)
+            for album_name, src in part["albums"].items():
+                album = by_album.get(album_name)
+                if album is None:
+                    by_album[album_name] = Album(
+                        list(src.files),
+                        list(src.direct_media),
+                        list(src.direct_names),
+                        src.info_file,
+                        dict(src.supplemental_map),
+                        src.supp_img_count,
+                        src.supp_vid_count,
                     )
-                    album["files"].append((zip_path, file_name))
+                    continue
+                album.files.extend(src.files)
+                album.direct_media.extend(src.direct_media)
+                album.direct_names.extend(src.direct_names)
+                if src.info_file is not None:
+                    album.info_file = src.info_file
+                for photo_name, ref in src.supplemental_map.items():
+                    # Prefer first seen mapping across zips as well
+                    if photo_name not in album.supplemental_map:
+                        album.supplemental_map[photo_name] = ref
+                        photo_col = _ext_column(photo_name)
+                        if photo_col == 0:
+                            album.supp_img_count += 1
+                        elif photo_col == 1:
+                            album.supp_vid_count += 1
+
+        # Lookups of unknown basenames must not grow the index from here on
+        media_by_basename.default_factory = None
+
+        catalog = {
+            "by_zip": by_zip,
+            "by_zip_info": by_zip_info,
+            "by_zip_json": by_zip_json,
+            "by_zip_non_json": by_zip_non_json,
+            "by_album": by_album,
+            "media_by_basename": media_by_basename,
+            "folder_stats_by_zip": folder_stats_by_zip,
+        }
+        self._cache["album_catalog"] = catalog
+        if fingerprints is not None and (to_read or cached is None or cached["zip_files"] != zip_file_names):
+            # Only the listings are stored; the merged catalog is rebuilt from them on load
+            self._save_catalog_cache(
+                {
+                    "version": _CATALOG_CACHE_VERSION,
+                    "zip_files": zip_file_names,
+                    "fingerprints": fingerprints,
+                    "infos": {zp.name: [_info_record(zi) for zi in part["infos"]] for zp, part in parts},
+                }
+            )
+        return catalog
 
-                    if file_name.endswith("metadata.json") and parts[-1] == "metadata.json":
-                        album["info_file"] = (zip_path, file_name)
+    def _catalog_cache_file(self) -> Path:
+        """Location of the persisted catalog for this zip directory, under the config directory."""
+        digest = hashlib.blake2b(str(self.zip_directory.resolve()).encode("utf-8"), digest_size=16).hexdigest()
+        config_dir = self._config.config_dir if self._config is not None else _default_config_dir()
+        return config_dir / "cache" / f"catalog-{digest}.json"
+
+    def _zip_fingerprints(self) -> Optional[Dict[str, Tuple[int, int]]]:
+        """Map zip file name -> (mtime_ns, size), or None if any zip cannot be stat'ed."""
+        fingerprints: Dict[str, Tuple[int, int]] = {}
+        try:
+            for zp in self.zip_files:
+                st = os.stat(zp)
+                fingerprints[zp.name] = (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+        return fingerprints
 
-                    if ext in image_exts or ext in video_exts:
-                        album["direct_media"].append((zip_path, file_name))
+    def _load_catalog_cache(self) -> Optional[Dict[str, Any]]:
+        """Load the persisted zip listings, or None if missing, unreadable or outdated.
 
-                    if file_name.endswith(".supplemental-metadata.json"):
-                        photo_name = base.replace(".supplemental-metadata.json", "")
-                        # Prefer first seen mapping; do not overwrite if duplicates
-                        album["supplemental_map"].setdefault(photo_name, (zip_path, file_name))
+        Returns {"zip_files": [str], "fingerprints": {name: (mtime_ns, size)},
+        "infos": {name: [ZipInfo, ...]}}. The file is plain JSON, so a damaged or
+        foreign cache can only cause a rebuild.
+        """
+        try:
+            with open(self._catalog_cache_file(), "rb") as f:
+                data = _parse_json(f.read())
+            if not isinstance(data, dict) or data.get("version") != _CATALOG_CACHE_VERSION:
+                return None
+            return {
+                "zip_files": list(data["zip_files"]),
+                "fingerprints": {name: tuple(fp) for name, fp in data["fingerprints"].items()},
+                "infos": {
+                    name: [_info_from_record(record) for record in records] for name, records in data["infos"].items()
+                },
+            }
+        except Exception:
+            return None
 
-        catalog = {"by_zip": by_zip, "by_album": by_album, "media_by_basename": media_by_basename}
-        self._cache["album_catalog"] = catalog
-        return catalog
+    def _save_catalog_cache(self, data: Dict[str, Any]) -> None:
+        """Write the catalog cache atomically; failures only cost a rebuild next run."""
+        cache_file = self._catalog_cache_file()
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            payload = orjson.dumps(data) if orjson is not None else json.dumps(data, separators=(",", ":")).encode()
+            with open(tmp_file, "wb") as f:
+                f.write(payload)
+            os.replace(tmp_file, cache_file)
+        except Exception:
+            try:
+                os.unlink(tmp_file)
+            except OSError:
+                pass
 
-    def _get_album_data(self, album_name: str) -> Optional[Dict[str, Any]]:
+    def _get_album_data(self, album_name: str) -> Optional[Album]:
         catalog = self._ensure_catalog()
         return catalog["by_album"].get(album_name)
 
@@ -160,9 +867,29 @@ class GooglePhotosExplorer:
         return self._ensure_catalog(progress_callback=progress_callback, force_refresh=force_refresh)
 
     def clear_catalog_cache(self) -> None:
-        """Public API: clear the cached album/media catalog."""
-        if "album_catalog" in self._cache:
-            del self._cache["album_catalog"]
+        """Public API: clear the cached album/media catalog (in memory and on disk)."""
+        self._cache.pop("album_catalog", None)
+        self._cache.pop("zip_fingerprints", None)
+        self.close_zip_handles()
+        try:
+            os.unlink(self._catalog_cache_file())
+        except OSError:
+            pass
+
+    def total_zip_size(self) -> int:
+        """Combined size in bytes of all zip files.
+
+        Reuses the sizes stat'ed when the catalog was built; otherwise stats each zip
+        once and keeps the result until clear_catalog_cache().
+        """
+        fingerprints = self._cache.get("zip_fingerprints")
+        if fingerprints is None:
+            fingerprints = self._zip_fingerprints()
+            if fingerprints is None:
+                # Some zip cannot be stat'ed; let the error surface to the caller
+                return sum(zp.stat().st_size for zp in self.zip_files)
+            self._cache["zip_fingerprints"] = fingerprints
+        return sum(size for _mtime_ns, size in fingerprints.values())
 
     def list_zips(self) -> List[Dict[str, Any]]:
         """List all zip files found.
@@ -196,25 +923,25 @@ class GooglePhotosExplorer:
         catalog = self._ensure_catalog()
         file_list = catalog["by_zip"].get(zip_path, [])
 
-        # Categorize files
-        images = []
-        videos = []
-        json_files = []
-        other = []
-
-        image_exts = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"}
-        video_exts = {".mp4", ".mov", ".avi", ".wmv", ".m4v", ".mpg", ".mpeg"}
+        # Categorize files: one table lookup picks the bucket (default: other)
+        images: List[str] = []
+        videos: List[str] = []
+        json_files: List[str] = []
+        other: List[str] = []
+        buckets = (images, videos, json_files, other)
+        ext_bucket = _EXT_BUCKET
 
         for file_name in file_list:
-            ext = Path(file_name).suffix.lower()
-            if ext in image_exts:
-                images.append(file_name)
-            elif ext in video_exts:
-                videos.append(file_name)
-            elif ext == ".json":
-                json_files.append(file_name)
+            base = file_name[file_name.rfind("/") + 1 :]
+            dot = base.rfind(".")
+            if dot > 0:
+                raw_ext = base[dot:]
+                idx = ext_bucket.get(raw_ext)
+                if idx is None:
+                    idx = ext_bucket.get(raw_ext.lower(), 3)
             else:
-                other.append(file_name)
+                idx = 3
+            buckets[idx].append(file_name)
 
         return {
             "zip_name": zip_path.name,
@@ -228,26 +955,28 @@ class GooglePhotosExplorer:
             "sample_files": file_list[:10],
         }
 
-    def search_files(self, pattern: str, progress_callback=None) -> Dict[str, List[str]]:
+    def search_files(self, pattern: Union[str, Pattern[str]], progress_callback=None) -> Dict[str, List[str]]:
         """Search for files matching a pattern across all zips.
 
         Args:
-            pattern: Regex pattern to search for
+            pattern: Regex pattern to search for (case-insensitive), or a compiled pattern
             progress_callback: Optional callback for progress updates
 
         Returns:
             Dictionary mapping zip names to lists of matching files
         """
-        regex = re.compile(pattern, re.IGNORECASE)
+        regex = _compile_pattern(pattern)
         results: Dict[str, List[str]] = {}
 
         catalog = self._ensure_catalog()
         by_zip: Dict[Path, List[str]] = catalog["by_zip"]
 
+        # filter() drives the bound search method from C, with no per-name bytecode
+        search = regex.search
         total = len(self.zip_files)
         for idx, zip_path in enumerate(self.zip_files, 1):
             names = by_zip.get(zip_path, [])
-            matches = [fn for fn in names if regex.search(fn)]
+            matches = list(filter(search, names))
             if matches:
                 results[zip_path.name] = matches
             if progress_callback:
@@ -255,41 +984,47 @@ class GooglePhotosExplorer:
 
         return results
 
-    def extract_metadata(self, filename_pattern: str, progress_callback=None) -> List[Dict]:
-        """Extract metadata from JSON files matching a pattern.
+    def extract_metadata(self, filename_pattern: Union[str, Pattern[str]], progress_callback=None) -> List[Dict]:
+        """Extract metadata from JSON files matching a pattern (a string or compiled pattern).
 
         Returns:
             List of metadata dictionaries
         """
-        regex = re.compile(filename_pattern, re.IGNORECASE)
-        all_metadata: List[Dict[str, Any]] = []
+        regex = _compile_pattern(filename_pattern)
 
         catalog = self._ensure_catalog()
-        by_zip: Dict[Path, List[str]] = catalog["by_zip"]
-
-        total = len(self.zip_files)
-        for idx, zip_path in enumerate(self.zip_files, 1):
-            names = by_zip.get(zip_path, [])
-            json_candidates = [fn for fn in names if fn.endswith(".json") and regex.search(fn)]
-            if json_candidates:
-                try:
-                    with zipfile.ZipFile(zip_path, "r") as zf:
-                        for file_name in json_candidates:
-                            try:
-                                with zf.open(file_name) as f:
-                                    metadata = json.load(f)
-                                metadata["_source_zip"] = zip_path.name
-                                metadata["_source_file"] = file_name
-                                all_metadata.append(metadata)
-                            except Exception:
-                                # Skip corrupted files
-                                pass
-                except Exception:
-                    # If a zip cannot be opened, skip it
-                    pass
-            if progress_callback:
-                progress_callback(idx, total)
+        by_zip_json: Dict[Path, List[str]] = catalog["by_zip_json"]
+
+        def worker(zip_path: Path) -> List[Dict[str, Any]]:
+            # Each zip is read and parsed on its own pool thread; zlib inflate
+            # releases the GIL, so zips decompress concurrently.
+            json_candidates = list(filter(regex.search, by_zip_json.get(zip_path, [])))
+            found: List[Dict[str, Any]] = []
+            if not json_candidates:
+                return found
+            try:
+                with self._get_zip(zip_path) as zf:
+                    for file_name in json_candidates:
+                        try:
+                            metadata = _load_json(zf, file_name)
+                            metadata["_source_zip"] = zip_path.name
+                            metadata["_source_file"] = file_name
+                            found.append(metadata)
+                        except Exception:
+                            # Skip corrupted files
+                            pass
+            except Exception:
+                # If a zip cannot be opened, skip it
+                pass
+            return found
 
+        # Media-only zips have nothing to parse and are never opened
+        json_zips = [zp for zp in self.zip_files if by_zip_json.get(zp)]
+        all_metadata: List[Dict[str, Any]] = []
+        for _zip_path, found in self._map_zips_parallel(
+            worker, progress_callback=progress_callback, zip_paths=json_zips
+        ):
+            all_metadata.extend(found)
         return all_metadata
 
     def get_date_range(self, progress_callback=None) -> Dict[str, Any]:
@@ -298,50 +1033,49 @@ class GooglePhotosExplorer:
         Returns:
             Dictionary with date analysis results
         """
-        dates: List[int] = []
-        errors = 0
-
         catalog = self._ensure_catalog()
-        by_zip: Dict[Path, List[str]] = catalog["by_zip"]
+        by_zip_info: Dict[Path, Dict[str, zipfile.ZipInfo]] = catalog["by_zip_info"]
+        by_zip_json: Dict[Path, List[str]] = catalog["by_zip_json"]
 
-        total = len(self.zip_files)
-        for idx, zip_path in enumerate(self.zip_files, 1):
-            names = by_zip.get(zip_path, [])
-            json_files = [f for f in names if f.endswith(".json")]
+        def worker(zip_path: Path) -> Tuple["array[int]", int]:
+            infos = by_zip_info[zip_path]
+            json_infos = [infos[name] for name in by_zip_json[zip_path]]
             local_errors = 0
-            local_dates: List[int] = []
-            try:
-                with zipfile.ZipFile(zip_path, "r") as zf:
-                    for json_file in json_files:
-                        try:
-                            with zf.open(json_file) as f:
-                                metadata = json.load(f)
-                            timestamp = None
-                            if "photoTakenTime" in metadata:
-                                timestamp = metadata["photoTakenTime"].get("timestamp")
-                            elif "creationTime" in metadata:
-                                timestamp = metadata["creationTime"].get("timestamp")
-                            if timestamp:
-                                local_dates.append(int(timestamp))
-                        except Exception:
-                            local_errors += 1
-            except Exception:
-                local_errors += len(json_files)
+            # Unboxed int64 buffer: 8 bytes per timestamp instead of a list of int objects
+            local_dates = array("q")
+            for info in json_infos:
+                try:
+                    metadata = _parse_json(self._read_member(zip_path, info))
+                    timestamp = None
+                    if "photoTakenTime" in metadata:
+                        timestamp = metadata["photoTakenTime"].get("timestamp")
+                    elif "creationTime" in metadata:
+                        timestamp = metadata["creationTime"].get("timestamp")
+                    if timestamp:
+                        local_dates.append(int(timestamp))
+                except Exception:
+                    local_errors += 1
+            return local_dates, local_errors
 
-            if local_dates:
-                dates.extend(local_dates)
+        dates = array("q")
+        errors = 0
+        json_zips = [zp for zp in self.zip_files if by_zip_json.get(zp)]
+        for _zip_path, (local_dates, local_errors) in self._map_zips_parallel(
+            worker, progress_callback=progress_callback, zip_paths=json_zips
+        ):
+            dates.extend(local_dates)
             errors += local_errors
-            if progress_callback:
-                progress_callback(idx, total)
 
         if dates:
-            dates.sort()
+            # Only the extremes are reported, so two linear scans replace a full sort
+            earliest = min(dates)
+            latest = max(dates)
             return {
                 "total_photos": len(dates),
-                "earliest_timestamp": dates[0],
-                "latest_timestamp": dates[-1],
-                "earliest_date": datetime.fromtimestamp(dates[0]),
-                "latest_date": datetime.fromtimestamp(dates[-1]),
+                "earliest_timestamp": earliest,
+                "latest_timestamp": latest,
+                "earliest_date": datetime.fromtimestamp(earliest),
+                "latest_date": datetime.fromtimestamp(latest),
                 "errors": errors,
             }
 
@@ -360,12 +1094,13 @@ class GooglePhotosExplorer:
         output_dir = Path(output_dir)
         output_dir.mkdir(exist_ok=True)
 
-        with zipfile.ZipFile(zip_path, "r") as zf:
-            if file_path in zf.namelist():
-                zf.extract(file_path, output_dir)
-                return True
-
-        return False
+        with self._get_zip(zip_path) as zf:
+            try:
+                info = zf.getinfo(file_path)
+            except KeyError:
+                return False
+            zf.extract(info, output_dir)
+            return True
 
     def list_folders(self, progress_callback=None, resolve_references=True) -> Dict[str, Any]:
         """List all unique folders across all zip files with file counts using cached catalog."""
@@ -373,29 +1108,24 @@ class GooglePhotosExplorer:
         by_zip = catalog["by_zip"]
         by_album = catalog["by_album"]
 
-        # Track folders and their file counts
-        folder_stats = defaultdict(lambda: {"images": 0, "videos": 0, "json": 0, "other": 0})
-        total_files = 0
-
-        image_exts = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"}
-        video_exts = {".mp4", ".mov", ".avi", ".wmv", ".m4v", ".mpg", ".mpeg"}
-
-        # Count files directly in folders using cached namelists
-        for _zip_path, names in by_zip.items():
-            for file_name in names:
-                total_files += 1
-                folder = str(Path(file_name).parent)
-                if folder and folder != ".":
-                    ext = Path(file_name).suffix.lower()
-                    entry = folder_stats[folder]
-                    if ext in image_exts:
-                        entry["images"] += 1
-                    elif ext in video_exts:
-                        entry["videos"] += 1
-                    elif ext == ".json":
-                        entry["json"] += 1
-                    else:
-                        entry["other"] += 1
+        # Merge per-zip [images, videos, json, other] rows gathered during the catalog pass
+        folder_rows: Dict[str, List[int]] = {}
+        total_files = sum(len(names) for names in by_zip.values())
+
+        for _zip_path, zip_folder_stats in catalog["folder_stats_by_zip"].items():
+            for folder, counts in zip_folder_stats.items():
+                row = folder_rows.get(folder)
+                if row is None:
+                    folder_rows[folder] = list(counts)
+                else:
+                    row[0] += counts[0]
+                    row[1] += counts[1]
+                    row[2] += counts[2]
+                    row[3] += counts[3]
+
+        # Reify the rows as the documented per-folder dicts
+        columns = _FOLDER_COLUMNS
+        folder_stats = {folder: dict(zip(columns, row)) for folder, row in folder_rows.items()}
 
         # Group by album (top-level folders)
         album_folders: Dict[str, Dict[str, int]] = {}
@@ -426,12 +1156,9 @@ class GooglePhotosExplorer:
                     album = by_album.get(album_name)
                     if not album:
                         continue
-                    for photo_name in album["supplemental_map"].keys():
-                        ext = Path(photo_name).suffix.lower()
-                        if ext in image_exts:
-                            album_folders[album_name]["images_referenced"] += 1
-                        elif ext in video_exts:
-                            album_folders[album_name]["videos_referenced"] += 1
+                    # Referenced media were counted per album during the catalog pass
+                    album_folders[album_name]["images_referenced"] += album.supp_img_count
+                    album_folders[album_name]["videos_referenced"] += album.supp_vid_count
 
                     album_folders[album_name]["images"] = (
                         album_folders[album_name]["images_direct"] + album_folders[album_name]["images_referenced"]
@@ -443,7 +1170,7 @@ class GooglePhotosExplorer:
         return {
             "total_folders": len(folder_stats),
             "total_files": total_files,
-            "folder_stats": dict(folder_stats),
+            "folder_stats": folder_stats,
             "album_folders": album_folders,
         }
 
@@ -456,73 +1183,98 @@ class GooglePhotosExplorer:
         album = self._get_album_data(album_name)
         if not album:
             return []
-        return [(zp.name, path) for (zp, path) in album["files"]]
+        return [(zp.name, path) for (zp, path) in album.files]
 
-    def resolve_album_photos(self, album_name: str) -> Dict[str, List[Tuple[Path, str]]]:
+    def resolve_album_photos(self, album_name: str, include_parsed: bool = False) -> Dict[str, Any]:
         """Resolve actual photo locations from album metadata using cached catalog.
 
         Albums often only contain metadata files that reference photos stored elsewhere.
         This method finds the actual photos referenced by the album.
 
+        Args:
+            album_name: Album to resolve
+            include_parsed: Also return the JSON parsed along the way, so callers
+                such as export_albums do not read it again
+
         Returns:
             Dict with 'metadata' and 'photos' lists of (zip_path, file_path) tuples
+            and 'photo_names', the basename of each entry in 'photos';
+            with include_parsed, also 'album_supplemental_parsed' ({photo_name: dict})
+            and 'candidate_ts' ({(zip_path, file_path): timestamp or None})
         """
         catalog = self._ensure_catalog()
         album = catalog["by_album"].get(album_name)
+        supplemental_parsed: Dict[str, Any] = {}
+        candidate_ts: Dict[Tuple[Path, str], Optional[int]] = {}
+
+        def result(
+            photos: List[Tuple[Path, str]], metadata: List[Tuple[Path, str]], names: List[str]
+        ) -> Dict[str, Any]:
+            out: Dict[str, Any] = {"metadata": metadata, "photos": photos, "photo_names": names}
+            if include_parsed:
+                out["album_supplemental_parsed"] = supplemental_parsed
+                out["candidate_ts"] = candidate_ts
+            return out
+
         if not album:
-            return {"metadata": [], "photos": []}
+            return result([], [], [])
 
-        metadata_files: List[Tuple[Path, str]] = list(album["files"])  # Preserve original behavior
-        supplemental_map: Dict[str, Tuple[Path, str]] = album["supplemental_map"]
+        metadata_files: List[Tuple[Path, str]] = list(album.files)  # Preserve original behavior
+        supplemental_map: Dict[str, Tuple[Path, str]] = album.supplemental_map
         media_by_basename: Dict[str, List[Tuple[Path, str]]] = catalog["media_by_basename"]
-
-        def read_taken_ts(zp: Path, meta_path: str) -> Optional[int]:
-            try:
-                with zipfile.ZipFile(zp, "r") as zf:
-                    with zf.open(meta_path) as f:
-                        meta = json.load(f)
-                ts = None
-                if isinstance(meta, dict):
-                    if "photoTakenTime" in meta and isinstance(meta["photoTakenTime"], dict):
-                        ts = meta["photoTakenTime"].get("timestamp")
-                    if not ts and "creationTime" in meta and isinstance(meta["creationTime"], dict):
-                        ts = meta["creationTime"].get("timestamp")
-                return int(ts) if ts else None
-            except Exception:
-                return None
-
-        # Helper to extract timestamp from a candidate's sibling JSON
-        def candidate_timestamp(zp: Path, candidate_path: str) -> Optional[int]:
-            try:
-                with zipfile.ZipFile(zp, "r") as zf:
-                    json_path = f"{candidate_path}.json"
-                    if json_path in zf.namelist():
-                        with zf.open(json_path) as jf:
-                            meta = json.load(jf)
-                    else:
-                        return None
-                ts = None
-                if isinstance(meta, dict):
-                    if "photoTakenTime" in meta and isinstance(meta["photoTakenTime"], dict):
-                        ts = meta["photoTakenTime"].get("timestamp")
-                    if not ts and "creationTime" in meta and isinstance(meta["creationTime"], dict):
-                        ts = meta["creationTime"].get("timestamp")
-                return int(ts) if ts else None
-            except Exception:
-                return None
+        by_zip_info: Dict[Path, Dict[str, zipfile.ZipInfo]] = catalog["by_zip_info"]
+
+        def read_batch(keys: List[Tuple[Path, str]]) -> Dict[Tuple[Path, str], Any]:
+            """Parse the given JSON members, one zip at a time in on-disk order."""
+            by_zip: DefaultDict[Path, List[Tuple[int, str, zipfile.ZipInfo]]] = defaultdict(list)
+            for zp, path in keys:
+                info = by_zip_info.get(zp, {}).get(path)
+                if info is not None:
+                    by_zip[zp].append((info.header_offset, path, info))
+            parsed: Dict[Tuple[Path, str], Any] = {}
+            for zp, entries in by_zip.items():
+                # Ascending header offsets turn scattered reads into one forward scan
+                entries.sort(key=_BY_OFFSET)
+                for _offset, path, info in entries:
+                    try:
+                        parsed[(zp, path)] = _parse_json(self._read_member(zp, info))
+                    except Exception:
+                        pass
+            return parsed
 
         resolved_photos: List[Tuple[Path, str]] = []
+        resolved_names: List[str] = []  # parallel to resolved_photos
         if supplemental_map:
+            # Phase 1: every album supplemental, batched per zip
+            parsed_supplementals = read_batch(list(supplemental_map.values()))
             referenced_info: Dict[str, Dict[str, Any]] = {}
-            for photo_name, (zp, mpath) in supplemental_map.items():
-                referenced_info[photo_name] = {"taken_ts": read_taken_ts(zp, mpath)}
-
+            for photo_name, ref_key in supplemental_map.items():
+                meta = parsed_supplementals.get(ref_key)
+                if ref_key in parsed_supplementals:
+                    supplemental_parsed[photo_name] = meta
+                referenced_info[photo_name] = {"taken_ts": _taken_timestamp(meta)}
+
+            # Phase 2: sibling JSON of every candidate that needs a timestamp comparison
+            pending: Dict[Tuple[Path, str], None] = {}
+            for photo_name, ref in referenced_info.items():
+                if ref["taken_ts"] is None:
+                    continue
+                candidates = media_by_basename.get(photo_name, [])
+                if len(candidates) > 1:
+                    for key in candidates:
+                        pending.setdefault(key, None)
+            parsed_siblings = read_batch([(zp, f"{cand}.json") for zp, cand in pending])
+            for zp, cand in pending:
+                candidate_ts[(zp, cand)] = _taken_timestamp(parsed_siblings.get((zp, f"{cand}.json")))
+
+            # Phase 3: resolve against the parsed data; no further I/O
             for photo_name, ref in referenced_info.items():
                 candidates = media_by_basename.get(photo_name, [])
                 if not candidates:
                     continue
                 if len(candidates) == 1:
                     resolved_photos.append(candidates[0])
+                    resolved_names.append(photo_name)
                     continue
 
                 taken_ts_ref = ref.get("taken_ts")
@@ -530,15 +1282,17 @@ class GooglePhotosExplorer:
                 json_matches: List[Tuple[Path, str]] = []
                 if taken_ts_ref is not None:
                     for zp, cand in candidates:
-                        ts = candidate_timestamp(zp, cand)
+                        ts = candidate_ts[(zp, cand)]
                         if ts is not None and abs(int(ts) - int(taken_ts_ref)) <= 2:
                             json_matches.append((zp, cand))
                 if len(json_matches) == 1:
                     resolved_photos.append(json_matches[0])
+                    resolved_names.append(photo_name)
                     continue
                 if len(json_matches) > 1:
                     # If more than one JSON match, pick lexicographically smallest path for determinism
-                    resolved_photos.append(sorted(json_matches, key=lambda t: t[1])[0])
+                    resolved_photos.append(min(json_matches, key=_BY_PATH))
+                    resolved_names.append(photo_name)
                     continue
 
                 # 2) Use year hint from referenced timestamp and path segments
@@ -556,15 +1310,18 @@ class GooglePhotosExplorer:
                                 year_matches.append(cand)
                 if len(year_matches) == 1:
                     resolved_photos.append(year_matches[0])
+                    resolved_names.append(photo_name)
                     continue
                 if len(year_matches) > 1:
-                    resolved_photos.append(sorted(year_matches, key=lambda t: t[1])[0])
+                    resolved_photos.append(min(year_matches, key=_BY_PATH))
+                    resolved_names.append(photo_name)
                     continue
 
                 # 3) Fallback: deterministic first by full path to avoid missing items
-                resolved_photos.append(sorted(candidates, key=lambda t: t[1])[0])
+                resolved_photos.append(min(candidates, key=_BY_PATH))
+                resolved_names.append(photo_name)
 
-        return {"metadata": metadata_files, "photos": resolved_photos}
+        return result(resolved_photos, metadata_files, resolved_names)
 
     def export_albums(
         self, album_names: List[str], output_dir: str, progress_callback=None, file_progress_callback=None
@@ -604,10 +1361,11 @@ class GooglePhotosExplorer:
 
             # Build export set using cached catalog
             catalog = self._ensure_catalog()
+            by_zip_info: Dict[Path, Dict[str, zipfile.ZipInfo]] = catalog["by_zip_info"]
             album = catalog["by_album"].get(album_name)
             files_to_export: List[Tuple[Path, str]] = []
             exported_photos = set()
-            metadata_map: Dict[str, Tuple[Path, str]] = dict(album["supplemental_map"]) if album else {}
+            metadata_map: Dict[str, Tuple[Path, str]] = dict(album.supplemental_map) if album else {}
             album_path = f"Takeout/Google Photos/{album_name}/"
 
             if not album:
@@ -615,38 +1373,38 @@ class GooglePhotosExplorer:
                 continue
 
             # album metadata.json
-            if album.get("info_file"):
-                files_to_export.append(album["info_file"])  # type: ignore[index]
+            if album.info_file:
+                files_to_export.append(album.info_file)
 
             # direct media in album
-            for zip_path, file_name in album["direct_media"]:
-                photo_name = Path(file_name).name
+            for (zip_path, file_name), photo_name in zip(album.direct_media, album.direct_names):
                 files_to_export.append((zip_path, file_name))
                 exported_photos.add(photo_name)
                 if photo_name in metadata_map:
                     files_to_export.append(metadata_map[photo_name])
 
             # referenced media resolved via cached index
-            resolved = self.resolve_album_photos(album_name)
-            for zip_path, file_name in resolved["photos"]:
-                photo_name = Path(file_name).name
+            resolved = self.resolve_album_photos(album_name, include_parsed=True)
+            supplemental_parsed: Dict[str, Any] = resolved["album_supplemental_parsed"]
+            for (zip_path, file_name), photo_name in zip(resolved["photos"], resolved["photo_names"]):
                 if photo_name not in exported_photos:
                     files_to_export.append((zip_path, file_name))
                     exported_photos.add(photo_name)
                     if photo_name in metadata_map:
                         files_to_export.append(metadata_map[photo_name])
 
-            # Prepare manifest entries (media files only)
-            manifest_entries: List[Dict[str, Any]] = []
-
-            # Export files
-            for file_idx, (zip_path, file_name) in enumerate(files_to_export, 1):
-                if file_progress_callback:
-                    file_progress_callback(file_idx, len(files_to_export), album_name)
+            # Manifest entries (media files only) are streamed to disk as they are built
+            manifest = _ManifestWriter(album_dir / "manifest.json", album_name)
 
+            # Plan outputs and write the manifest in album order; extraction happens below
+            extract_jobs: List[Tuple[Path, str, Path]] = []
+            planned_outputs = set()
+            for zip_path, file_name in files_to_export:
                 try:
+                    photo_name, ext = _name_and_ext(file_name)
                     # Determine output path
-                    if file_name.startswith(album_path):
+                    in_album = file_name.startswith(album_path)
+                    if in_album:
                         # File is directly in album folder - preserve structure
                         relative_path = file_name[len(album_path) :]
                         if not relative_path:  # Skip if it's just the directory itself
@@ -655,70 +1413,68 @@ class GooglePhotosExplorer:
                     else:
                         # File is referenced from elsewhere - put directly in album folder
                         # This includes both photos from other locations and their metadata
-                        output_file = album_dir / Path(file_name).name
+                        output_file = album_dir / photo_name
 
-                    # Skip if file already exists
-                    if output_file.exists():
+                    # Skip if file already exists (or is already planned in this album)
+                    if output_file in planned_outputs or output_file.exists():
+                        supplemental_parsed.pop(photo_name, None)  # no manifest entry will need it
                         album_stats["skipped"] += 1
                         stats["skipped"] += 1
                         continue
+                    planned_outputs.add(output_file)
 
                     # Create subdirectories if needed
                     output_file.parent.mkdir(parents=True, exist_ok=True)
 
                     # If this is a media file, collect metadata for manifest
-                    ext = Path(file_name).suffix.lower()
-                    is_media = ext in {
-                        ".jpg",
-                        ".jpeg",
-                        ".png",
-                        ".gif",
-                        ".bmp",
-                        ".webp",
-                        ".heic",
-                        ".mp4",
-                        ".mov",
-                        ".avi",
-                        ".wmv",
-                        ".m4v",
-                        ".mpg",
-                        ".mpeg",
-                    }
-                    if is_media:
-                        rel_for_manifest = relative_path if file_name.startswith(album_path) else Path(file_name).name
+                    if ext in MEDIA_EXTS:
+                        rel_for_manifest = relative_path if in_album else photo_name
                         file_entry: Dict[str, Any] = {
                             "relative_path": rel_for_manifest,
                             "source_zip": zip_path.name,
                             "archive_path": file_name,
                         }
                         # Album supplemental metadata (if present)
-                        photo_name = Path(file_name).name
-                        if photo_name in metadata_map:
+                        if photo_name in supplemental_parsed:
+                            # Already parsed while resolving references; popped so each
+                            # dict is freed once its entry is written, not at album end
+                            file_entry["albumSupplemental"] = supplemental_parsed.pop(photo_name)
+                        elif photo_name in metadata_map:
                             m_zip, m_path = metadata_map[photo_name]
                             try:
-                                with zipfile.ZipFile(m_zip, "r") as zf_meta:
-                                    with zf_meta.open(m_path) as mf:
-                                        file_entry["albumSupplemental"] = json.load(mf)
+                                # ZipInfo straight from the catalog: no per-entry name scan or reopen
+                                m_info = by_zip_info[m_zip][m_path]
+                                file_entry["albumSupplemental"] = _parse_json(self._read_member(m_zip, m_info))
                             except Exception:
                                 pass
-                        # Original metadata (sibling JSON)
+                        # Original metadata (sibling JSON); membership from the catalog's per-zip index
                         try:
-                            with zipfile.ZipFile(zip_path, "r") as zf_src:
-                                jpath = f"{file_name}.json"
-                                if jpath in zf_src.namelist():
-                                    with zf_src.open(jpath) as jf:
-                                        file_entry["original"] = json.load(jf)
+                            jinfo = by_zip_info.get(zip_path, {}).get(f"{file_name}.json")
+                            if jinfo is not None:
+                                file_entry["original"] = _parse_json(self._read_member(zip_path, jinfo))
                         except Exception:
                             pass
-                        manifest_entries.append(file_entry)
+                        manifest.write_entry(file_entry)
 
-                    # Extract file
-                    with zipfile.ZipFile(zip_path, "r") as zf:
-                        with zf.open(file_name) as source:
+                    extract_jobs.append((zip_path, file_name, output_file))
+                except Exception:
+                    album_stats["errors"] += 1
+                    stats["errors"] += 1
+
+            # Extract files zip by zip in archive order so each zip is read front to back
+            order = self._archive_order([(zip_path, file_name) for zip_path, file_name, _ in extract_jobs])
+            for done, job_idx in enumerate(order, 1):
+                if file_progress_callback:
+                    file_progress_callback(done, len(order), album_name)
+                zip_path, file_name, output_file = extract_jobs[job_idx]
+                try:
+                    member = by_zip_info.get(zip_path, {}).get(file_name, file_name)
+                    with self._get_zip(zip_path) as zf:
+                        with zf.open(member) as source:
                             with open(output_file, "wb") as target:
-                                data = source.read()
-                                target.write(data)
-                                file_size = len(data)
+                                # Stream in 1 MiB chunks so large videos are never held in RAM
+                                shutil.copyfileobj(source, target, 1024 * 1024)
+                                file_size = target.tell()
                                 album_stats["size"] += file_size
                                 stats["total_size"] += file_size
 
@@ -729,17 +1485,8 @@ class GooglePhotosExplorer:
                     album_stats["errors"] += 1
                     stats["errors"] += 1
 
-            # Write manifest.json into album directory
-            try:
-                manifest = {
-                    "album": album_name,
-                    "entries": manifest_entries,
-                }
-                with open(album_dir / "manifest.json", "w") as mf:
-                    json.dump(manifest, mf, indent=2)
-            except Exception:
-                # Non-fatal
-                pass
+            # Finish manifest.json in the album directory
+            manifest.close()
 
             stats["albums_exported"] += 1
             stats["album_details"][album_name] = album_stats
@@ -750,6 +1497,185 @@ class GooglePhotosExplorer:
     # Upload functionality
     # -----------------------
 
+    def _stream_member(
+        self,
+        provider: Any,
+        zip_path: Path,
+        file_name: str,
+        destination_path: str,
+        content_type: Optional[str],
+    ) -> None:
+        """Upload a member straight from its decompressing reader, without a full copy in RAM."""
+        with self._get_zip(zip_path) as zf:
+            info = zf.getinfo(file_name)
+            with zf.open(info) as source:
+                provider.upload_stream(
+                    _ForwardOnlyReader(source), destination_path, content_type=content_type, length=info.file_size
+                )
+
+    def _thumbnail_pool(self) -> ThreadPoolExecutor:
+        """Executor for generate_thumbnail_stream, so resizing overlaps the original's upload."""
+        with self._thumb_pool_lock:
+            if self._thumb_pool is None:
+                self._thumb_pool = ThreadPoolExecutor(max_workers=_THUMBNAIL_WORKERS, thread_name_prefix="thumbnail")
+            return self._thumb_pool
+
+    def _archive_order(self, members: List[Tuple[Path, str]]) -> List[int]:
+        """Indices of (zip_path, file_name) members sorted by zip, then header offset.
+
+        Reading in this order walks each zip front to back, which suits OS
+        readahead far better than album or name order.
+        """
+        by_zip_info = self._ensure_catalog()["by_zip_info"]
+        zip_rank = {zip_path: rank for rank, zip_path in enumerate(self.zip_files)}
+        keys = []
+        for zip_path, file_name in members:
+            info = by_zip_info.get(zip_path, {}).get(file_name)
+            keys.append((zip_rank.get(zip_path, len(zip_rank)), info.header_offset if info is not None else -1))
+        return sorted(range(len(members)), key=keys.__getitem__)
+
+    def _run_uploads(
+        self,
+        items: List[Any],
+        upload_one: Callable[[Any], Any],
+        progress_callback: Optional[Callable[[int, int, Any], None]] = None,
+        max_workers: int = UPLOAD_CONCURRENCY,
+        order: Optional[List[int]] = None,
+    ) -> List[Any]:
+        """Run upload_one over items on a thread pool so several PUTs are in flight.
+
+        Network I/O releases the GIL and cached ZipFile handles support
+        concurrent member reads. progress_callback(completed, total, item) is
+        called on this thread as uploads finish. order, if given, is the
+        sequence of item indices to submit (see _archive_order).
+
+        Returns:
+            upload_one results in the order of items.
+        """
+        total = len(items)
+        if total == 0:
+            return []
+        results: List[Any] = [None] * total
+        with ThreadPoolExecutor(max_workers=min(max_workers, total)) as executor:
+            submit_order = order if order is not None else range(total)
+            future_to_idx = {executor.submit(upload_one, items[idx]): idx for idx in submit_order}
+            completed = 0
+            for fut in as_completed(future_to_idx):
+                idx = future_to_idx[fut]
+                results[idx] = fut.result()
+                completed += 1
+                if progress_callback:
+                    progress_callback(completed, total, items[idx])
+        return results
+
+    def _run_upload_jobs(
+        self,
+        jobs: List[_UploadJob],
+        provider: Any,
+        progress_callback: Optional[Callable[[int, int, _UploadJob], None]] = None,
+        include_thumbnails: bool = False,
+        thumbnails_only: bool = False,
+        error_context: Optional[Dict[str, Any]] = None,
+        max_workers: int = UPLOAD_CONCURRENCY,
+    ) -> List[Dict[str, Any]]:
+        """Upload every job's original and/or thumbnail; the one upload path behind all public uploaders.
+
+        Jobs are read in archive order on the upload pool (see _run_uploads);
+        thumbnails are resized on the thumbnail pool while the original is sent.
+
+        Returns:
+            One outcome per job, in job order: {"files": uploaded object count,
+            "error": None or an error detail dict prefixed with error_context}
+        """
+        thumb_pool = self._thumbnail_pool() if include_thumbnails or thumbnails_only else None
+        context = error_context or {}
+
+        def upload_one(job: _UploadJob) -> Dict[str, Any]:
+            outcome: Dict[str, Any] = {"files": 0, "error": None}
+            try:
+                # The thumbnailer needs the whole image; everything else is streamed
+                data: Optional[bytes] = None
+                thumb_future = None
+                if thumb_pool is not None and job.thumb_dest is not None:
+                    with self._get_zip(job.zip_path) as zf:
+                        data = zf.read(job.archive_path)
+                    thumb_future = thumb_pool.submit(
+                        generate_thumbnail_stream, data, original_ext=job.ext, max_size=(512, 512)
+                    )
+
+                # Upload original unless thumbnails_only is set
+                if not thumbnails_only:
+                    if data is not None:
+                        # Large images are split into parallel blocks by the SDK (max_concurrency)
+                        provider.upload_bytes(data, job.dest, content_type=job.content_type)
+                    else:
+                        self._stream_member(provider, job.zip_path, job.archive_path, job.dest, job.content_type)
+                    outcome["files"] += 1
+
+                # Upload thumbnail if requested and if it's an image we can handle
+                if thumb_future is not None:
+                    try:
+                        thumb, thumb_ct = thumb_future.result()
+                        if thumb_ct:
+                            provider.upload_stream(
+                                thumb, job.thumb_dest, content_type=thumb_ct, length=len(thumb.getbuffer())
+                            )
+                            outcome["files"] += 1
+                    except Exception:
+                        # Ignore thumbnail errors; originals may still upload
+                        pass
+            except Exception as e:
+                # Capture the error for the sample shown to the user
+                outcome["error"] = {
+                    **context,
+                    "file": job.archive_path,
+                    "dest": job.dest,
+                    "error": f"{type(e).__name__}: {e}",
+                }
+            return outcome
+
+        return self._run_uploads(
+            jobs,
+            upload_one,
+            progress_callback,
+            max_workers=max_workers,
+            order=self._archive_order([(job.zip_path, job.archive_path) for job in jobs]),
+        )
+
+    def _upload_archive_members(
+        self,
+        members: List[Tuple[Path, str]],
+        provider: Any,
+        base_prefix: str,
+        stats: Dict[str, Any],
+        file_progress_callback=None,
+        include_thumbnails: bool = False,
+        thumbnails_only: bool = False,
+        max_workers: int = UPLOAD_CONCURRENCY,
+    ) -> None:
+        """Upload (zip_path, file_name) members keeping their archive paths; updates stats."""
+        thumbnails = include_thumbnails or thumbnails_only
+        dest_prefix = sanitize_blob_path(base_prefix)
+        jobs = [_upload_job(zip_path, file_name, file_name, dest_prefix, thumbnails) for zip_path, file_name in members]
+
+        def progress(done: int, total: int, job: _UploadJob) -> None:
+            file_progress_callback(done, total, job.archive_path)
+
+        outcomes = self._run_upload_jobs(
+            jobs,
+            provider,
+            progress if file_progress_callback else None,
+            include_thumbnails=include_thumbnails,
+            thumbnails_only=thumbnails_only,
+            max_workers=max_workers,
+        )
+        for outcome in outcomes:
+            stats["files_uploaded"] += outcome["files"]
+            if outcome["error"] is not None:
+                stats["errors"] += 1
+                if len(stats["error_details"]) < 50:
+                    stats["error_details"].append(outcome["error"])
+
     def upload_albums(
         self,
         album_names: List[str],
@@ -771,8 +1697,9 @@ class GooglePhotosExplorer:
         Returns:
             Statistics dictionary
         """
-        config = ConfigManager()
+        config = self._config if self._config is not None else ConfigManager()
         provider, base_prefix = build_provider(config, target)
+        concurrency = target.concurrency if target is not None else UPLOAD_CONCURRENCY
 
         stats = {
             "albums_uploaded": 0,
@@ -783,9 +1710,6 @@ class GooglePhotosExplorer:
             "error_details": [],  # sample of errors across all albums
         }
 
-        image_exts = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"}
-        video_exts = {".mp4", ".mov", ".avi", ".wmv", ".m4v", ".mpg", ".mpeg"}
-
         for album_idx, album_name in enumerate(album_names, 1):
             if progress_callback:
                 progress_callback(album_idx, len(album_names), album_name)
@@ -804,10 +1728,11 @@ class GooglePhotosExplorer:
 
             # Build upload set using cached catalog
             catalog = self._ensure_catalog()
+            by_zip_info = catalog["by_zip_info"]
             album = catalog["by_album"].get(album_name)
             files_to_upload: List[Tuple[Path, str]] = []
             exported_photos = set()
-            metadata_map = dict(album["supplemental_map"]) if album else {}
+            metadata_map = dict(album.supplemental_map) if album else {}
 
             if not album:
                 album_stats["skipped"] += 1
@@ -815,143 +1740,111 @@ class GooglePhotosExplorer:
                 continue
 
             # album metadata.json (if include_metadata)
-            if include_metadata and album.get("info_file"):
-                files_to_upload.append(album["info_file"])  # type: ignore[index]
+            if include_metadata and album.info_file:
+                files_to_upload.append(album.info_file)
 
             # direct media in album
-            for zip_path, file_name in album["direct_media"]:
+            for (zip_path, file_name), photo_name in zip(album.direct_media, album.direct_names):
                 files_to_upload.append((zip_path, file_name))
-                photo_name = Path(file_name).name
                 exported_photos.add(photo_name)
                 if include_metadata and photo_name in metadata_map:
                     files_to_upload.append(metadata_map[photo_name])
 
             # referenced media resolved via cached index
             resolved = self.resolve_album_photos(album_name)
-            for zip_path, file_name in resolved["photos"]:
-                photo_name = Path(file_name).name
+            for (zip_path, file_name), photo_name in zip(resolved["photos"], resolved["photo_names"]):
                 if photo_name not in exported_photos:
                     files_to_upload.append((zip_path, file_name))
                     exported_photos.add(photo_name)
                     if include_metadata and photo_name in metadata_map:
                         files_to_upload.append(metadata_map[photo_name])
 
-            # Upload
-            manifest_entries: List[Dict[str, Any]] = []
-            for file_idx, (zip_path, file_name) in enumerate(files_to_upload, 1):
-                if file_progress_callback:
-                    file_progress_callback(file_idx, len(files_to_upload), album_name)
-                try:
-                    # Determine destination under prefix/album_name
-                    dest_relative: str
-                    if file_name.startswith(album_path):
-                        rel = file_name[len(album_path) :]
-                        if not rel:
-                            continue
-                        # Flatten to album_name/<image_name or metadata>
-                        dest_relative = f"{album_name}/{Path(rel).name}"
-                    else:
-                        dest_relative = f"{album_name}/{Path(file_name).name}"
-
-                    destination_path = sanitize_blob_path(base_prefix + dest_relative)
-                    content_type = detect_content_type(file_name)
-
-                    # Upload original and/or thumbnail
-                    with zipfile.ZipFile(zip_path, "r") as zf:
-                        with zf.open(file_name) as source:
-                            data = source.read()
-
-                    ext = Path(file_name).suffix.lower()
-                    is_image = ext in {
-                        ".jpg",
-                        ".jpeg",
-                        ".png",
-                        ".gif",
-                        ".bmp",
-                        ".webp",
-                        ".heic",
-                    }
-
-                    # Upload original unless thumbnails_only is set
-                    if not thumbnails_only:
-                        provider.upload_bytes(data, destination_path, content_type=content_type)
-                        album_stats["files"] += 1
-                        stats["files_uploaded"] += 1
-
-                    # Upload thumbnail if requested and if it's an image we can handle
-                    if (include_thumbnails or thumbnails_only) and is_image:
-                        try:
-                            thumb_bytes, thumb_ct = generate_thumbnail(data, original_ext=ext, max_size=(512, 512))
-                            if thumb_bytes and thumb_ct:
-                                thumb_dest_relative = f"{album_name}/thumb-" + Path(dest_relative).name
-                                thumb_destination_path = sanitize_blob_path(base_prefix + thumb_dest_relative)
-                                provider.upload_bytes(thumb_bytes, thumb_destination_path, content_type=thumb_ct)
-                                album_stats["files"] += 1
-                                stats["files_uploaded"] += 1
-                        except Exception:
-                            # Ignore thumbnail errors; originals may still upload
-                            pass
-
-                    # If media, collect manifest entry with metadata
-                    ext = Path(file_name).suffix.lower()
-                    if ext in image_exts or ext in video_exts:
-                        entry: Dict[str, Any] = {
-                            "relative_path": dest_relative.split(f"{album_name}/", 1)[-1],
-                            "destination": destination_path,
-                            "source_zip": zip_path.name,
-                            "archive_path": file_name,
-                        }
-                        # Album supplemental metadata (if present)
-                        photo_name = Path(file_name).name
-                        if photo_name in metadata_map:
-                            m_zip, m_path = metadata_map[photo_name]
-                            try:
-                                with zipfile.ZipFile(m_zip, "r") as zf_meta:
-                                    with zf_meta.open(m_path) as mf:
-                                        entry["albumSupplemental"] = json.load(mf)
-                            except Exception:
-                                pass
-                        # Original metadata (sibling JSON)
-                        try:
-                            with zipfile.ZipFile(zip_path, "r") as zf_src:
-                                jpath = f"{file_name}.json"
-                                if jpath in zf_src.namelist():
-                                    with zf_src.open(jpath) as jf:
-                                        entry["original"] = json.load(jf)
-                        except Exception:
-                            pass
-                        manifest_entries.append(entry)
-                except Exception as e:
+            # One job per file; the album directory entry itself is not uploaded.
+            # Flatten to album_name/<image_name or metadata>.
+            thumbnails = include_thumbnails or thumbnails_only
+            album_prefix = sanitize_blob_path(f"{base_prefix}{album_name}/")
+            jobs = [
+                _upload_job(zip_path, file_name, file_name[file_name.rfind("/") + 1 :], album_prefix, thumbnails)
+                for zip_path, file_name in files_to_upload
+                if file_name != album_path
+            ]
+
+            # Upload files concurrently; results are folded in file order below
+            outcomes = self._run_upload_jobs(
+                jobs,
+                provider,
+                (lambda done, total, _job: file_progress_callback(done, total, album_name))
+                if file_progress_callback
+                else None,
+                include_thumbnails=include_thumbnails,
+                thumbnails_only=thumbnails_only,
+                error_context={"album": album_name},
+                max_workers=concurrency,
+            )
+            # Media files that uploaded cleanly get a manifest entry
+            media_jobs: List[_UploadJob] = []
+            for job, outcome in zip(jobs, outcomes):
+                album_stats["files"] += outcome["files"]
+                stats["files_uploaded"] += outcome["files"]
+                detail = outcome["error"]
+                if detail is not None:
                     album_stats["errors"] += 1
                     stats["errors"] += 1
                     # Capture a limited sample of errors for display
-                    detail = {
-                        "album": album_name,
-                        "file": file_name,
-                        "dest": destination_path,
-                        "error": f"{type(e).__name__}: {e}",
-                    }
                     if len(album_stats["error_details"]) < 20:
                         album_stats["error_details"].append(detail)
                     if len(stats["error_details"]) < 50:
                         stats["error_details"].append(detail)
+                elif job.is_media:
+                    media_jobs.append(job)
+
+            # Stream manifest entries into a spool as the metadata is joined, so
+            # neither the entries nor the parsed sidecars pile up in memory
+            manifest = _ManifestWriter(None, album_name)
+            for job in media_jobs:
+                entry: Dict[str, Any] = {
+                    "relative_path": job.name,
+                    "destination": job.dest,
+                    "source_zip": job.zip_path.name,
+                    "archive_path": job.archive_path,
+                }
+                zip_path, file_name = job.zip_path, job.archive_path
+                # Album supplemental metadata (if present)
+                supplemental = metadata_map.get(job.name)
+                if supplemental is not None:
+                    m_zip, m_path = supplemental
+                    try:
+                        m_info = by_zip_info[m_zip][m_path]
+                        entry["albumSupplemental"] = _parse_json(self._read_member(m_zip, m_info))
+                    except Exception:
+                        pass
+                # Original metadata (sibling JSON); membership from the catalog's per-zip index
+                try:
+                    jinfo = by_zip_info.get(zip_path, {}).get(f"{file_name}.json")
+                    if jinfo is not None:
+                        entry["original"] = _parse_json(self._read_member(zip_path, jinfo))
+                except Exception:
+                    pass
+                manifest.write_entry(entry)
 
             # Upload manifest.json for this album
             try:
-                manifest = {
-                    "album": album_name,
-                    "entries": manifest_entries,
-                }
-                manifest_bytes = json.dumps(manifest, indent=2).encode("utf-8")
-                manifest_path = sanitize_blob_path(base_prefix + f"{album_name}/manifest.json")
-                provider.upload_bytes(
-                    manifest_bytes,
-                    manifest_path,
-                    content_type="application/json",
-                )
+                manifest_stream = manifest.finish()
+                if manifest_stream is not None:
+                    manifest_path = join_blob_path(album_prefix, "manifest.json")
+                    length = manifest_stream.seek(0, io.SEEK_END)
+                    manifest_stream.seek(0)
+                    provider.upload_stream(
+                        manifest_stream,
+                        manifest_path,
+                        content_type="application/json",
+                        length=length,
+                    )
             except Exception:
                 # Non-fatal
                 pass
+            finally:
+                manifest.close()
 
             stats["albums_uploaded"] += 1
             stats["album_details"][album_name] = album_stats
@@ -960,7 +1853,7 @@ class GooglePhotosExplorer:
 
     def upload_by_pattern(
         self,
-        pattern: str,
+        pattern: Union[str, Pattern[str]],
         target: Optional[UploadTarget] = None,
         include_metadata: bool = False,
         progress_callback=None,
@@ -970,12 +1863,14 @@ class GooglePhotosExplorer:
     ) -> Dict[str, Any]:
         """Upload files matching a regex pattern across all zips.
 
+        pattern is a regex string (case-insensitive) or a compiled pattern.
         Note: include_metadata will only include JSON files that also match the pattern.
         """
-        config = ConfigManager()
+        config = self._config if self._config is not None else ConfigManager()
         provider, base_prefix = build_provider(config, target)
+        concurrency = target.concurrency if target is not None else UPLOAD_CONCURRENCY
 
-        regex = re.compile(pattern, re.IGNORECASE)
+        regex = _compile_pattern(pattern)
         stats = {
             "files_uploaded": 0,
             "errors": 0,
@@ -988,55 +1883,28 @@ class GooglePhotosExplorer:
         catalog = self._ensure_catalog()
         by_zip: Dict[Path, List[str]] = catalog["by_zip"]
         total = len(self.zip_files)
+        # Without include_metadata the regex only sees the catalog's non-JSON names,
+        # and, as in search_files, filter() runs it over each zip's names from C
+        candidates_by_zip: Dict[Path, List[str]] = by_zip if include_metadata else catalog["by_zip_non_json"]
+        search = regex.search
         for idx, zip_path in enumerate(self.zip_files, 1):
-            names = by_zip.get(zip_path, [])
-            for file_name in names:
-                if regex.search(file_name):
-                    if not include_metadata and file_name.lower().endswith(".json"):
-                        continue
-                    all_matches.append((zip_path, file_name))
+            names = candidates_by_zip.get(zip_path, [])
+            all_matches.extend([(zip_path, file_name) for file_name in filter(search, names)])
             if progress_callback:
                 progress_callback(idx, total)
 
         stats["total_matched"] = len(all_matches)
 
-        for idx, (zip_path, file_name) in enumerate(all_matches, 1):
-            if file_progress_callback:
-                file_progress_callback(idx, len(all_matches), file_name)
-            try:
-                # Keep pattern uploads preserving relative structure but sanitized
-                destination_path = sanitize_blob_path(base_prefix + file_name)
-                content_type = detect_content_type(file_name)
-                with zipfile.ZipFile(zip_path, "r") as zf:
-                    with zf.open(file_name) as source:
-                        data = source.read()
-
-                ext = Path(file_name).suffix.lower()
-                is_image = ext in {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"}
-
-                if not thumbnails_only:
-                    provider.upload_bytes(data, destination_path, content_type=content_type)
-                    stats["files_uploaded"] += 1
-
-                if (include_thumbnails or thumbnails_only) and is_image:
-                    try:
-                        thumb_bytes, thumb_ct = generate_thumbnail(data, original_ext=ext, max_size=(512, 512))
-                        if thumb_bytes and thumb_ct:
-                            from pathlib import Path as _P
-
-                            thumb_archive_path = str(_P(file_name).with_name("thumb-" + _P(file_name).name))
-                            thumb_destination_path = sanitize_blob_path(base_prefix + thumb_archive_path)
-                            provider.upload_bytes(thumb_bytes, thumb_destination_path, content_type=thumb_ct)
-                            stats["files_uploaded"] += 1
-                    except Exception:
-                        pass
-            except Exception as e:
-                stats["errors"] += 1
-                if len(stats["error_details"]) < 50:
-                    stats["error_details"].append(
-                        {"file": file_name, "dest": destination_path, "error": f"{type(e).__name__}: {e}"}
-                    )
-
+        self._upload_archive_members(
+            all_matches,
+            provider,
+            base_prefix,
+            stats,
+            file_progress_callback,
+            include_thumbnails,
+            thumbnails_only,
+            max_workers=concurrency,
+        )
         return stats
 
     def upload_from_results(
@@ -1049,8 +1917,9 @@ class GooglePhotosExplorer:
         thumbnails_only: bool = False,
     ) -> Dict[str, Any]:
         """Upload files from a precomputed results mapping of zip_name -> file paths."""
-        config = ConfigManager()
+        config = self._config if self._config is not None else ConfigManager()
         provider, base_prefix = build_provider(config, target)
+        concurrency = target.concurrency if target is not None else UPLOAD_CONCURRENCY
 
         name_to_path = {p.name: p for p in self.zip_files}
 
@@ -1072,41 +1941,14 @@ class GooglePhotosExplorer:
             "error_details": [],
         }
 
-        for idx, (zip_path, file_name) in enumerate(pending, 1):
-            if file_progress_callback:
-                file_progress_callback(idx, len(pending), file_name)
-            try:
-                destination_path = sanitize_blob_path(base_prefix + file_name)
-                content_type = detect_content_type(file_name)
-                with zipfile.ZipFile(zip_path, "r") as zf:
-                    with zf.open(file_name) as source:
-                        data = source.read()
-
-                ext = Path(file_name).suffix.lower()
-                is_image = ext in {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"}
-
-                if not thumbnails_only:
-                    provider.upload_bytes(data, destination_path, content_type=content_type)
-                    stats["files_uploaded"] += 1
-
-                if (include_thumbnails or thumbnails_only) and is_image:
-                    try:
-                        thumb_bytes, thumb_ct = generate_thumbnail(data, original_ext=ext, max_size=(512, 512))
-                        if thumb_bytes and thumb_ct:
-                            from pathlib import Path as _P
-
-                            thumb_archive_path = str(_P(file_name).with_name("thumb-" + _P(file_name).name))
-                            thumb_destination_path = sanitize_blob_path(base_prefix + thumb_archive_path)
-                            provider.upload_bytes(thumb_bytes, thumb_destination_path, content_type=thumb_ct)
-                            stats["files_uploaded"] += 1
-                    except Exception:
-                        pass
-            except Exception as e:
-                stats["errors"] += 1
-                if len(stats["error_details"]) < 50:
-                    stats["error_details"].append(
-                        {"file": file_name, "dest": destination_path, "error": f"{type(e).__name__}: {e}"}
-                    )
-
-        return stats
+        self._upload_archive_members(
+            pending,
+            provider,
+            base_prefix,
+            stats,
+            file_progress_callback,
+            include_thumbnails,
+            thumbnails_only,
+            max_workers=concurrency,
+        )
         return stats
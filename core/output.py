@@ -1,7 +1,35 @@
 """Output formatting for Google Photos Explorer."""
 
+import functools
 import json
-from typing import Any, Dict, List, Optional, Tuple
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    # Optional C-accelerated JSON; stdlib json is used when unavailable
+    import orjson
+except Exception:  # pragma: no cover - the dependency may not be installed
+    orjson = None  # type: ignore
+
+# Minimum seconds between per-file progress redraws; each redraw is a flushed terminal write
+PROGRESS_INTERVAL = 1 / 30
+
+
+def throttle_progress(callback: Callable[..., None]) -> Callable[..., None]:
+    """Wrap a (current, total, ...) progress callback to run at most every PROGRESS_INTERVAL.
+
+    Intermediate updates in between are dropped; the final one (current == total) always runs.
+    """
+    last = [0.0]
+
+    @functools.wraps(callback)
+    def wrapper(current: int, total: int, *args: Any) -> None:
+        now = time.monotonic()
+        if current >= total or now - last[0] >= PROGRESS_INTERVAL:
+            last[0] = now
+            callback(current, total, *args)
+
+    return wrapper
 
 
 class OutputFormatter:
@@ -67,11 +95,24 @@ class OutputFormatter:
             print("\nSample metadata (first entry):")
             print(json.dumps(metadata[0], indent=2))
 
+    @staticmethod
+    def write_json(data: Any, output_file: str) -> None:
+        """Write data as 2-space indented JSON, serialized straight to bytes by orjson when available."""
+        payload: Optional[bytes] = None
+        if orjson is not None:
+            try:
+                payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+            except TypeError:  # orjson.JSONEncodeError, e.g. integers beyond 64 bits
+                pass
+        if payload is None:
+            payload = json.dumps(data, indent=2).encode("utf-8")
+        with open(output_file, "wb") as f:
+            f.write(payload)
+
     @staticmethod
     def save_metadata(metadata: List[Dict], output_file: str) -> None:
         """Save metadata to JSON file."""
-        with open(output_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        OutputFormatter.write_json(metadata, output_file)
         print(f"Metadata saved to {output_file}")
 
     @staticmethod
@@ -157,6 +198,15 @@ class OutputFormatter:
         bar = "█" * filled + "░" * (bar_length - filled)
         print(f"\r{prefix} {bar} {percent:.1f}% ({current}/{total} zips)", end="", flush=True)
 
+    @staticmethod
+    def print_file_progress(current: int, total: int) -> None:
+        """Print a progress bar for per-file export/upload work."""
+        percent = (current / total * 100) if total > 0 else 0
+        bar_length = 40
+        filled = int(bar_length * current / total) if total > 0 else 0
+        bar = "█" * filled + "░" * (bar_length - filled)
+        print(f"\r  {bar} {percent:.1f}% ({current}/{total} files)", end="", flush=True)
+
     @staticmethod
     def print_export_progress(current: int, total: int, item_name: str, prefix: str = "Exporting") -> None:
         """Print export progress with item name."""
@@ -257,3 +307,15 @@ class OutputFormatter:
                     print(f"  {idx:3d}. [{zip_name}] {path}")
                 if count_meta > max_show_meta:
                     print(f"  ... and {count_meta - max_show_meta} more")
+
+
+def file_progress_bar() -> Callable[..., None]:
+    """A fresh (current, total, item_name) callback drawing print_file_progress, throttled.
+
+    Each call gets its own throttle state, so make one per export/upload run.
+    """
+
+    def draw(current: int, total: int, _item_name: Any = None) -> None:
+        OutputFormatter.print_file_progress(current, total)
+
+    return throttle_progress(draw)
@@ -1,40 +1,37 @@
 """Thumbnail generation utilities.
 
-This module provides a helper to generate image thumbnails from raw bytes.
+This module provides helpers to generate image thumbnails from raw bytes,
+returned either as bytes or as a stream ready for upload.
 """
 
 from __future__ import annotations
 
 import io
-from typing import Optional, Tuple
+from typing import IO, Optional, Tuple
+
+try:
+    # Imported once at load; a thumbnail is generated for every uploaded image
+    from PIL import Image
+except Exception:  # pragma: no cover - environment dependency
+    Image = None  # type: ignore
+
+_LANCZOS = Image.LANCZOS if Image is not None else None
 
 SUPPORTED_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp"}
 
+# Image.info keys under which Pillow exposes embedded EXIF/XMP metadata (JPEG, PNG, WebP)
+_METADATA_INFO_KEYS = ("exif", "xmp", "XML:com.adobe.xmp")
 
-def _ext_to_pil_format(ext: str) -> Optional[str]:
-    ext = ext.lower()
-    mapping = {
-        ".jpg": "JPEG",
-        ".jpeg": "JPEG",
-        ".png": "PNG",
-        ".gif": "GIF",
-        ".bmp": "BMP",
-        ".webp": "WEBP",
-    }
-    return mapping.get(ext)
-
-
-def _ext_to_content_type(ext: str) -> Optional[str]:
-    ext = ext.lower()
-    mapping = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".gif": "image/gif",
-        ".bmp": "image/bmp",
-        ".webp": "image/webp",
-    }
-    return mapping.get(ext)
+
+# Lowercase extension -> (Pillow output format, content type); one lookup yields both
+_EXT_INFO = {
+    ".jpg": ("JPEG", "image/jpeg"),
+    ".jpeg": ("JPEG", "image/jpeg"),
+    ".png": ("PNG", "image/png"),
+    ".gif": ("GIF", "image/gif"),
+    ".bmp": ("BMP", "image/bmp"),
+    ".webp": ("WEBP", "image/webp"),
+}
 
 
 def generate_thumbnail(
@@ -42,45 +39,99 @@ def generate_thumbnail(
     *,
     original_ext: str,
     max_size: Tuple[int, int] = (512, 512),
+    jpeg_quality: int = 82,
+    optimize: bool = False,
+    webp_method: int = 0,
 ) -> Tuple[bytes, Optional[str]]:
     """Create a thumbnail for an image.
 
+    Takes the same arguments as generate_thumbnail_stream.
+
+    Returns:
+        (thumbnail_bytes, content_type). If format unsupported, returns (b"", None).
+
+    Raises:
+        RuntimeError if Pillow is not installed.
+    """
+    thumb, content_type = generate_thumbnail_stream(
+        image_bytes,
+        original_ext=original_ext,
+        max_size=max_size,
+        jpeg_quality=jpeg_quality,
+        optimize=optimize,
+        webp_method=webp_method,
+    )
+    return thumb.getvalue(), content_type
+
+
+def generate_thumbnail_stream(
+    image_bytes: bytes,
+    *,
+    original_ext: str,
+    max_size: Tuple[int, int] = (512, 512),
+    jpeg_quality: int = 82,
+    optimize: bool = False,
+    webp_method: int = 0,
+) -> Tuple[IO[bytes], Optional[str]]:
+    """Create a thumbnail for an image as an in-memory stream.
+
     Args:
         image_bytes: Raw image bytes
         original_ext: File extension including dot (e.g., ".jpg")
         max_size: Max (width, height) for the thumbnail box
+        jpeg_quality: JPEG encoder quality
+        optimize: Spend extra encoder passes (optimized Huffman tables,
+            progressive scans) for slightly smaller JPEGs
+        webp_method: libwebp effort, 0 (fastest) to 6 (smallest); 4 is libwebp's default
 
     Returns:
-        (thumbnail_bytes, content_type)
+        (thumbnail, content_type): thumbnail is a BytesIO positioned at the start,
+        ready to hand to an uploader's upload_stream without copying it to bytes.
+        content_type is None (and the stream empty) for formats that cannot be written.
 
     Raises:
         RuntimeError if Pillow is not installed.
     """
-    try:
-        from PIL import Image
-    except Exception as e:  # pragma: no cover - environment dependency
-        raise RuntimeError("Pillow is required for thumbnail generation. Install 'Pillow'.") from e
+    if Image is None:
+        raise RuntimeError("Pillow is required for thumbnail generation. Install 'Pillow'.")
 
-    pil_format = _ext_to_pil_format(original_ext)
-    if pil_format is None:
+    info = _EXT_INFO.get(original_ext.lower())
+    if info is None:
         # Unsupported format for output (e.g., .heic). Let caller decide to skip.
-        return b"", None
+        return io.BytesIO(), None
+    pil_format, content_type = info
 
     with Image.open(io.BytesIO(image_bytes)) as img:
+        # Image.open only parses the header; a source that already fits the box
+        # in the output format is its own thumbnail, so skip decode and re-encode.
+        # Not when it carries EXIF/XMP (camera GPS among it): re-encoding drops them,
+        # and thumbnails must not leak more than they always have.
+        if (
+            img.format == pil_format
+            and img.width <= max_size[0]
+            and img.height <= max_size[1]
+            and not any(key in img.info for key in _METADATA_INFO_KEYS)
+        ):
+            return io.BytesIO(image_bytes), content_type
+        # JPEG sources can be decoded at a reduced DCT scale; keep 2x the box so
+        # LANCZOS still has detail to work with. Must run before any convert()/load().
+        if img.format == "JPEG":
+            img.draft("RGB", (max_size[0] * 2, max_size[1] * 2))
         # Ensure a deterministic mode for formats that do not support alpha
         if pil_format == "JPEG":
             if img.mode not in ("RGB", "L"):
                 img = img.convert("RGB")
         # Resize in-place preserving aspect ratio
-        img.thumbnail(max_size, Image.LANCZOS)
+        img.thumbnail(max_size, _LANCZOS)
 
         out = io.BytesIO()
         save_kwargs = {}
         if pil_format == "JPEG":
-            save_kwargs.update({"quality": 85, "optimize": True, "progressive": True})
+            # Baseline without a Huffman optimization pass by default: much faster
+            # to encode, and the size difference is small at thumbnail scale
+            save_kwargs.update({"quality": jpeg_quality, "optimize": optimize, "progressive": optimize})
         if pil_format == "WEBP":
-            save_kwargs.update({"quality": 80})
+            save_kwargs.update({"quality": 75, "method": webp_method})
         img.save(out, format=pil_format, **save_kwargs)
-        thumb_bytes = out.getvalue()
-        content_type = _ext_to_content_type(original_ext)
-        return thumb_bytes, content_type
+        out.seek(0)
+        return out, content_type
@@ -7,19 +7,50 @@ other providers (e.g., S3, GCS) can be added later.
 
 from __future__ import annotations
 
+import hashlib
 import io
+import re
+import string
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Dict, Iterable, Optional, Protocol, Tuple
+from typing import IO, Any, Callable, Dict, Iterable, List, Optional, Protocol, Tuple, Union
 
 from .config import ConfigManager
 
 try:
     # Lazy import to avoid hard dependency unless used
+    from azure.core.exceptions import ResourceNotFoundError
     from azure.storage.blob import BlobServiceClient, ContentSettings
 except Exception:  # pragma: no cover - the dependency may not be installed yet
     BlobServiceClient = None  # type: ignore
     ContentSettings = None  # type: ignore
+    ResourceNotFoundError = None  # type: ignore
+
+try:
+    # azure-core's default transport; used to size its connection pool
+    from azure.core.pipeline.transport import RequestsTransport
+    from requests import Session
+    from requests.adapters import HTTPAdapter
+except Exception:  # pragma: no cover - the dependency may not be installed yet
+    RequestsTransport = None  # type: ignore
+
+# Objects uploaded at once; each PUT is a latency-bound HTTPS round trip
+UPLOAD_CONCURRENCY = 16
+
+# SDK transfer tuning: blobs up to the single-put size go in one request,
+# larger streams are cut into blocks sent over parallel connections
+AZURE_MAX_SINGLE_PUT_SIZE = 64 * 1024 * 1024
+AZURE_MAX_BLOCK_SIZE = 8 * 1024 * 1024
+AZURE_MAX_CONCURRENCY = 8
+# Pooled HTTPS connections per client: every file worker may be sending blocks
+# at once, so size for the product; connections are only opened when needed
+AZURE_CONNECTION_POOL_SIZE = UPLOAD_CONCURRENCY * AZURE_MAX_CONCURRENCY
+
+# Providers kept alive for reuse by build_provider (connection pools, TLS sessions)
+_PROVIDER_CACHE_SIZE = 4
 
 
 class StorageProvider(Protocol):
@@ -32,7 +63,8 @@ class StorageProvider(Protocol):
         *,
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, str]] = None,
-    ) -> None: ...
+        skip_unchanged: bool = False,
+    ) -> Optional[bool]: ...
 
     def upload_stream(  # noqa: E704
         self,
@@ -41,6 +73,7 @@ class StorageProvider(Protocol):
         *,
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, str]] = None,
+        length: Optional[int] = None,
     ) -> None: ...
 
 
@@ -49,15 +82,40 @@ class UploadTarget:
     provider: str  # e.g., "azure"
     container: Optional[str] = None
     prefix: str = ""
+    concurrency: int = UPLOAD_CONCURRENCY  # files uploaded in parallel
 
 
 class AzureBlobStorageProvider:
     """Azure Blob Storage implementation of StorageProvider."""
 
-    def __init__(self, connection_string: str, container_name: str):
+    def __init__(
+        self,
+        connection_string: str,
+        container_name: str,
+        *,
+        max_concurrency: int = AZURE_MAX_CONCURRENCY,
+        max_single_put_size: int = AZURE_MAX_SINGLE_PUT_SIZE,
+        max_block_size: int = AZURE_MAX_BLOCK_SIZE,
+        connection_pool_size: int = AZURE_CONNECTION_POOL_SIZE,
+    ):
         if BlobServiceClient is None:
             raise RuntimeError("azure-storage-blob is required. Add it to requirements and install.")
-        self._client = BlobServiceClient.from_connection_string(connection_string)
+        self._max_concurrency = max_concurrency
+        client_kwargs: Dict[str, Any] = {}
+        if RequestsTransport is not None:
+            # The requests default of 10 connections per host is far below the
+            # number of concurrent PUTs; size the pool to match
+            session = Session()
+            adapter = HTTPAdapter(pool_connections=connection_pool_size, pool_maxsize=connection_pool_size)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            client_kwargs["transport"] = RequestsTransport(session=session, session_owner=True)
+        self._client = BlobServiceClient.from_connection_string(
+            connection_string,
+            max_single_put_size=max_single_put_size,
+            max_block_size=max_block_size,
+            **client_kwargs,
+        )
         self._container = self._client.get_container_client(container_name)
         # Ensure container exists
         try:
@@ -65,6 +123,13 @@ class AzureBlobStorageProvider:
         except Exception:
             pass  # already exists or insufficient permissions
 
+    def close(self) -> None:
+        """Close the client and its connection pool; the provider is unusable afterwards."""
+        try:
+            self._client.close()
+        except Exception:
+            pass  # best effort; the sockets are released at garbage collection otherwise
+
     def upload_bytes(
         self,
         data: bytes,
@@ -72,10 +137,37 @@ class AzureBlobStorageProvider:
         *,
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, str]] = None,
-    ) -> None:
+        skip_unchanged: bool = False,
+    ) -> bool:
+        """Upload data.
+
+        With skip_unchanged, the data is hashed and a blob whose stored Content-MD5
+        already matches is left as-is, so a re-run costs one properties request
+        instead of a full upload; uploaded blobs then record that MD5. Without it
+        nothing is hashed (single-put blobs still get a service-computed MD5).
+
+        Returns:
+            False if the upload was skipped, True otherwise
+        """
         blob_client = self._container.get_blob_client(destination_path)
-        content_settings = ContentSettings(content_type=content_type) if content_type else None
-        blob_client.upload_blob(data, overwrite=True, content_settings=content_settings, metadata=metadata)
+        content_md5 = None
+        if skip_unchanged:
+            # A change check, not a security use; keeps FIPS-mode builds working
+            content_md5 = hashlib.md5(data, usedforsecurity=False).digest()
+            try:
+                existing = blob_client.get_blob_properties().content_settings.content_md5
+            except ResourceNotFoundError:
+                existing = None
+            if existing is not None and bytes(existing) == content_md5:
+                return False
+        blob_client.upload_blob(
+            data,
+            overwrite=True,
+            content_settings=ContentSettings(content_type=content_type, content_md5=content_md5),
+            metadata=metadata,
+            max_concurrency=self._max_concurrency,
+        )
+        return True
 
     def upload_stream(
         self,
@@ -84,33 +176,71 @@ class AzureBlobStorageProvider:
         *,
         content_type: Optional[str] = None,
         metadata: Optional[Dict[str, str]] = None,
+        length: Optional[int] = None,
     ) -> None:
+        """Upload from a file-like object; the SDK reads and sends it block by block.
+
+        Passing length lets the SDK plan blocks without reading the stream to the end first.
+        A seekable stream is read by several threads at their own offsets; streams that
+        are costly to seek (zip members) should be passed as non-seekable, so the SDK
+        reads them once in order and still sends the blocks in parallel.
+        """
         blob_client = self._container.get_blob_client(destination_path)
         content_settings = ContentSettings(content_type=content_type) if content_type else None
-        blob_client.upload_blob(stream, overwrite=True, content_settings=content_settings, metadata=metadata)
+        blob_client.upload_blob(
+            stream,
+            length=length,
+            overwrite=True,
+            content_settings=content_settings,
+            metadata=metadata,
+            max_concurrency=self._max_concurrency,
+        )
+
+
+# Minimal mapping; Azure determines type from content_settings
+_CONTENT_TYPES: Dict[str, str] = {
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".png": "image/png",
+    ".gif": "image/gif",
+    ".bmp": "image/bmp",
+    ".webp": "image/webp",
+    ".heic": "image/heic",
+    ".mp4": "video/mp4",
+    ".mov": "video/quicktime",
+    ".avi": "video/x-msvideo",
+    ".wmv": "video/x-ms-wmv",
+    ".m4v": "video/x-m4v",
+    ".mpg": "video/mpeg",
+    ".mpeg": "video/mpeg",
+    ".json": "application/json",
+}
 
 
 def detect_content_type(filename: str) -> Optional[str]:
-    ext = Path(filename).suffix.lower()
-    # Minimal mapping; Azure determines type from content_settings
-    mapping = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".gif": "image/gif",
-        ".bmp": "image/bmp",
-        ".webp": "image/webp",
-        ".heic": "image/heic",
-        ".mp4": "video/mp4",
-        ".mov": "video/quicktime",
-        ".avi": "video/x-msvideo",
-        ".wmv": "video/x-ms-wmv",
-        ".m4v": "video/x-m4v",
-        ".mpg": "video/mpeg",
-        ".mpeg": "video/mpeg",
-        ".json": "application/json",
-    }
-    return mapping.get(ext)
+    # Same suffix rule as Path(filename).suffix, without building a PurePath per file
+    base = filename[filename.rfind("/") + 1 :]
+    dot = base.rfind(".")
+    if not 0 < dot < len(base) - 1:
+        return None
+    return _CONTENT_TYPES.get(base[dot:].lower())
+
+
+# Readable characters kept as-is in a blob path segment; everything else becomes '_'
+_SAFE_SEGMENT_CHARS = frozenset(string.ascii_letters + string.digits + " ._-()")
+
+
+class _SegmentTable(dict):
+    """str.translate table: unsafe ASCII is pre-mapped, any non-ASCII code point maps to '_'."""
+
+    def __missing__(self, codepoint: int) -> str:
+        return "_"
+
+
+# Built once; translate() is a single C-level pass, much cheaper than re.sub per segment
+_SEGMENT_TABLE = _SegmentTable(
+    {i: (chr(i) if chr(i) in _SAFE_SEGMENT_CHARS else "_") for i in range(128)}
+)
 
 
 def _sanitize_segment(segment: str) -> str:
@@ -123,15 +253,11 @@ def _sanitize_segment(segment: str) -> str:
       dot, parentheses
     - Ensure non-empty segment
     """
-    import re
-
     cleaned = segment.strip()
     if not cleaned:
         return "_"
-    # Replace backslashes entirely; they are path separators on Windows
-    cleaned = cleaned.replace("\\", "/")
-    # Only allow a safe subset per segment
-    cleaned = re.sub(r"[^A-Za-z0-9 ._\-()]", "_", cleaned)
+    # Only allow a safe subset per segment (a stray backslash ends up as '_' too)
+    cleaned = cleaned.translate(_SEGMENT_TABLE)
     # Remove trailing dots/spaces which can cause trouble
     cleaned = cleaned.rstrip(" .") or "_"
     # Azure suggests max segment length; keep it reasonable
@@ -148,6 +274,73 @@ def sanitize_blob_path(path: str) -> str:
     return "/".join(safe_parts)
 
 
+def join_blob_path(sanitized_prefix: str, path: str) -> str:
+    """Equivalent to sanitize_blob_path(prefix + "/" + path) for a prefix that is already sanitized.
+
+    Lets callers sanitize a shared prefix once instead of once per file.
+    """
+    rest = sanitize_blob_path(path)
+    if not sanitized_prefix:
+        return rest
+    if not rest:
+        return sanitized_prefix
+    return sanitized_prefix + "/" + rest
+
+
+# Azure container names: lowercase letters, digits and hyphens
+_CONTAINER_NAME = re.compile(r"[a-z0-9-]+")
+
+
+def _validate_container_name(name: str) -> None:
+    """Validate container name according to Azure rules."""
+    original = name
+    name = name.strip().strip('"').strip("'")
+    if original != name:
+        # If quotes were present, treat as invalid and provide guidance
+        msg = (
+            "Azure container name appears quoted: "
+            f"{original}. Remove quotes and try again (e.g., --container mycontainer)."
+        )
+        raise ValueError(msg)
+    if not (3 <= len(name) <= 63):
+        raise ValueError("Azure container name must be between 3 and 63 characters.")
+    if not _CONTAINER_NAME.fullmatch(name):
+        raise ValueError("Azure container name must use only lowercase letters, numbers, and hyphens (-).")
+    if not (name[0].isalnum() and name[-1].isalnum()):
+        raise ValueError("Azure container name must start and end with a letter or number.")
+
+
+_providers: "OrderedDict[Tuple[str, str], AzureBlobStorageProvider]" = OrderedDict()
+_providers_lock = threading.Lock()
+
+
+def _cached_azure_provider(connection_string: str, container: str) -> AzureBlobStorageProvider:
+    """Return a long-lived provider for this account and container (small LRU).
+
+    BlobServiceClient is thread-safe and meant to be reused; sharing it keeps
+    connection pools warm and skips the container-exists round trip per call.
+    """
+    key = (connection_string, container)
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is not None:
+            _providers.move_to_end(key)
+            return provider
+    created = AzureBlobStorageProvider(connection_string, container)
+    to_close: List[AzureBlobStorageProvider] = []
+    with _providers_lock:
+        provider = _providers.setdefault(key, created)
+        if provider is not created:
+            to_close.append(created)  # another thread built one first
+        _providers.move_to_end(key)
+        while len(_providers) > _PROVIDER_CACHE_SIZE:
+            to_close.append(_providers.popitem(last=False)[1])
+    # Release evicted clients' pooled sockets now rather than at garbage collection
+    for stale in to_close:
+        stale.close()
+    return provider
+
+
 def build_provider(config: ConfigManager, target: Optional[UploadTarget] = None) -> Tuple[StorageProvider, str]:
     """Build a provider based on config and target.
 
@@ -162,82 +355,115 @@ def build_provider(config: ConfigManager, target: Optional[UploadTarget] = None)
     if not connection_string or not container:
         raise ValueError("Azure is not configured. Set connection string and container.")
 
-    # Validate container name according to Azure rules
-    def _validate_container_name(name: str) -> None:
-        import re
-
-        original = name
-        name = name.strip().strip('"').strip("'")
-        if original != name:
-            # If quotes were present, treat as invalid and provide guidance
-            msg = (
-                "Azure container name appears quoted: "
-                f"{original}. Remove quotes and try again (e.g., --container mycontainer)."
-            )
-            raise ValueError(msg)
-        if not (3 <= len(name) <= 63):
-            raise ValueError("Azure container name must be between 3 and 63 characters.")
-        if not re.fullmatch(r"[a-z0-9-]+", name):
-            raise ValueError("Azure container name must use only lowercase letters, numbers, and hyphens (-).")
-        if not (name[0].isalnum() and name[-1].isalnum()):
-            raise ValueError("Azure container name must start and end with a letter or number.")
-
     _validate_container_name(container)
 
-    provider = AzureBlobStorageProvider(connection_string, container)
+    provider = _cached_azure_provider(connection_string, container)
     prefix = target.prefix or config.get_azure_default_prefix()
     if prefix and not prefix.endswith("/"):
         prefix = prefix + "/"
     return provider, prefix
 
 
+def _flatten_metadata(metadata: Dict[str, Any]) -> Dict[str, str]:
+    """Flatten metadata to string values where possible; non-string keys are dropped."""
+    return {k: str(v) for k, v in metadata.items() if isinstance(k, str)}
+
+
+# upload_files() data: bytes, an open stream, or a factory opening one in the worker
+_UploadData = Union[bytes, IO[bytes], Callable[[], IO[bytes]], None]
+
+# (archive_path, data, destination, content_type, metadata) as handed to upload_files() workers
+_PreparedUpload = Tuple[str, _UploadData, str, Optional[str], Optional[Dict[str, str]]]
+
+
 def upload_files(
-    files: Iterable[Tuple[Path, str, bytes | None, Dict[str, Any]]],
+    files: Iterable[Tuple[Path, str, _UploadData, Dict[str, Any]]],
     *,
     provider: StorageProvider,
     prefix: str = "",
     include_metadata: bool = True,
     progress: Optional[Callable[[int, int, str], None]] = None,
+    max_workers: int = UPLOAD_CONCURRENCY,
+    skip_unchanged: bool = False,
+    album_metadata: Optional[Dict[str, Any]] = None,
 ) -> Dict[str, Any]:
-    """Upload a list of files.
-
-    Each item in files is a tuple of (zip_path, archive_path, raw_bytes_or_none, metadata_dict).
-    If raw_bytes_or_none is None, caller will provide a stream when calling this function.
+    """Upload a list of files, up to max_workers at a time.
+
+    Each item in files is a tuple of (zip_path, archive_path, data, metadata_dict), where
+    data is bytes, a readable file-like object (e.g. a ZipExtFile from ZipFile.open),
+    or a zero-argument callable returning one. File-like data is streamed to the
+    provider block by block instead of being read into memory; the caller keeps
+    ownership and closes it. A callable is opened by the worker right before its
+    upload and closed after it, so only the files in flight hold a stream open, e.g.
+    functools.partial(zip_file.open, archive_path). If data is None, caller will
+    provide a stream when calling this function.
+    progress(completed, total, archive_path) is called as uploads finish; details
+    keep the order of files. With skip_unchanged, bytes data whose blob already
+    has the same content (by Content-MD5) is not sent again and counts as skipped.
+    album_metadata holds fields shared by every file; it is flattened once and
+    merged under each file's own metadata (file values win).
     """
-    total = 0
-    uploaded = 0
-    skipped = 0
-    errors = 0
-    details = []
-
-    iterable = list(files)
-    total = len(iterable)
-    for idx, (zip_path, archive_path, raw_bytes, metadata) in enumerate(iterable, 1):
+
+    # Destination, content type and flattened metadata are worked out in one pass up
+    # front, so the pooled workers only make the provider call
+    prepared: List[_PreparedUpload] = []
+    shared_md = _flatten_metadata(album_metadata) if include_metadata and album_metadata else None
+    # Callers often pass one metadata dict for many files; flatten each distinct dict
+    # once. Holding the dict in the value keeps its id() from being reused meanwhile.
+    flattened: Dict[int, Tuple[Dict[str, Any], Optional[Dict[str, str]]]] = {}
+    for _zip_path, archive_path, data, metadata in files:
+        md = shared_md
+        if include_metadata and metadata:
+            cached = flattened.get(id(metadata))
+            if cached is None:
+                own_md = _flatten_metadata(metadata)
+                cached = flattened[id(metadata)] = (metadata, {**shared_md, **own_md} if shared_md else own_md)
+            md = cached[1]
         dest = prefix + archive_path.replace("\\", "/")
-        content_type = detect_content_type(archive_path)
+        prepared.append((archive_path, data, dest, detect_content_type(archive_path), md))
+
+    def upload_one(item: _PreparedUpload) -> Dict[str, Any]:
+        archive_path, data, dest, content_type, md = item
         try:
-            if progress:
-                progress(idx, total, archive_path)
-            md = None
-            if include_metadata and metadata:
-                # Flatten metadata to string values where possible
-                md = {k: str(v) for k, v in metadata.items() if isinstance(k, str)}
-            if raw_bytes is not None:
-                provider.upload_bytes(raw_bytes, dest, content_type=content_type, metadata=md)
+            if callable(data):
+                with data() as stream:
+                    provider.upload_stream(stream, dest, content_type=content_type, metadata=md)
+            elif hasattr(data, "read"):
+                provider.upload_stream(data, dest, content_type=content_type, metadata=md)
             else:
-                # Caller must pass a stream if raw_bytes is None; open from disk is not available here
-                # For this project, raw_bytes will always be provided by reading from the zip
-                provider.upload_bytes(b"", dest, content_type=content_type, metadata=md)
-            uploaded += 1
-            details.append({"path": archive_path, "destination": dest, "status": "uploaded"})
+                # Caller must pass a stream if data is None; open from disk is not available here
+                # For this project, data will always be provided by reading from the zip
+                sent = provider.upload_bytes(
+                    data if data is not None else b"",
+                    dest,
+                    content_type=content_type,
+                    metadata=md,
+                    skip_unchanged=skip_unchanged,
+                )
+                if sent is False:
+                    return {"path": archive_path, "destination": dest, "status": "skipped"}
+            return {"path": archive_path, "destination": dest, "status": "uploaded"}
         except Exception as e:
-            errors += 1
-            details.append({"path": archive_path, "destination": dest, "status": "error", "error": str(e)})
-
+            return {"path": archive_path, "destination": dest, "status": "error", "error": str(e)}
+
+    total = len(prepared)
+    details: List[Dict[str, Any]] = [{}] * total
+    if total:
+        # Per-file results come back from the futures, so no shared counters need locking
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, total))) as executor:
+            future_to_idx = {executor.submit(upload_one, item): idx for idx, item in enumerate(prepared)}
+            for completed, fut in enumerate(as_completed(future_to_idx), 1):
+                idx = future_to_idx[fut]
+                details[idx] = fut.result()
+                if progress:
+                    progress(completed, total, prepared[idx][0])
+
+    uploaded = sum(1 for detail in details if detail["status"] == "uploaded")
+    skipped = sum(1 for detail in details if detail["status"] == "skipped")
     return {
         "total": total,
         "uploaded": uploaded,
         "skipped": skipped,
-        "errors": errors,
+        "errors": total - uploaded - skipped,
         "details": details,
     }
@@ -8,12 +8,6 @@ all. Supports both command-line and interactive modes.
 import argparse
 import sys
 
-from core.config import ConfigManager
-from core.explorer import GooglePhotosExplorer
-from core.output import OutputFormatter
-from core.upload import UploadTarget
-from interactive.shell import run_interactive
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -157,16 +151,24 @@ Examples:
 
     args = parser.parse_args()
 
+    # Imported only once arguments are valid: --help and usage errors never load the
+    # explorer, which pulls in the storage SDK and Pillow
+    from core.config import ConfigManager
+    from core.explorer import GooglePhotosExplorer
+    from core.output import OutputFormatter, file_progress_bar
+
     try:
         # Check if interactive mode requested
         if args.interactive:
+            from interactive.shell import run_interactive
+
             run_interactive(args.zip_directory)
             return
 
         # Create explorer and formatter for command-line mode
-        explorer = GooglePhotosExplorer(args.zip_directory)
-        formatter = OutputFormatter()
         config = ConfigManager()
+        explorer = GooglePhotosExplorer(args.zip_directory, config=config)
+        formatter = OutputFormatter()
 
         # Track if any action was performed
         action_performed = False
@@ -255,12 +257,7 @@ Examples:
             def album_progress(current, total, album_name):
                 print(f"\n[{current}/{total}] Exporting album: {album_name}")
 
-            def file_progress(current, total, album_name):
-                percent = (current / total * 100) if total > 0 else 0
-                bar_length = 40
-                filled = int(bar_length * current / total) if total > 0 else 0
-                bar = "█" * filled + "░" * (bar_length - filled)
-                print(f"\r  {bar} {percent:.1f}% ({current}/{total} files)", end="", flush=True)
+            file_progress = file_progress_bar()
 
             stats = explorer.export_albums(
                 album_names, args.export_to, progress_callback=album_progress, file_progress_callback=file_progress
@@ -277,16 +274,9 @@ Examples:
             def album_progress(current, total, album_name):
                 print(f"\n[{current}/{total}] Uploading album: {album_name}")
 
-            def file_progress(current, total, album_name):
-                percent = (current / total * 100) if total > 0 else 0
-                bar_length = 40
-                filled = int(bar_length * current / total) if total > 0 else 0
-                bar = "█" * filled + "░" * (bar_length - filled)
-                print(
-                    f"\r  {bar} {percent:.1f}% ({current}/{total} files)",
-                    end="",
-                    flush=True,
-                )
+            file_progress = file_progress_bar()
+
+            from core.upload import UploadTarget
 
             target = UploadTarget(
                 provider=args.provider,
@@ -311,12 +301,9 @@ Examples:
             def progress_callback(i, t):
                 formatter.print_progress(i, t, "Scanning")
 
-            def file_progress(current, total, item_name):
-                percent = (current / total * 100) if total > 0 else 0
-                bar_length = 40
-                filled = int(bar_length * current / total) if total > 0 else 0
-                bar = "█" * filled + "░" * (bar_length - filled)
-                print(f"\r  {bar} {percent:.1f}% ({current}/{total} files)", end="", flush=True)
+            file_progress = file_progress_bar()
+
+            from core.upload import UploadTarget
 
             target = UploadTarget(
                 provider=args.provider,
@@ -1,16 +1,109 @@
 """Interactive shell for Google Photos Explorer."""
 
+import argparse
+import bisect
 import cmd
-import json
+import functools
+import re
 import readline
+import shlex
 import sys
-from pathlib import Path
-from typing import List
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
 
-from core.config import ConfigManager
-from core.explorer import GooglePhotosExplorer
-from core.output import OutputFormatter
-from core.upload import UploadTarget
+try:
+    # Optional line editor: completion runs off the input thread, so typing never waits on it
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.completion import Completer, Completion, ThreadedCompleter
+    from prompt_toolkit.history import FileHistory
+except Exception:  # pragma: no cover - the dependency may not be installed
+    PromptSession = None  # type: ignore
+    Completer = object  # type: ignore
+
+from core.config import ConfigManager, _default_config_dir
+from core.explorer import MEDIA_EXTS, GooglePhotosExplorer
+from core.output import OutputFormatter, file_progress_bar
+from core.upload import UPLOAD_CONCURRENCY, UploadTarget
+
+# macOS ships readline as a libedit shim with its own binding syntax; probed once at import
+_USING_LIBEDIT = "libedit" in (readline.__doc__ or "")
+
+# Lines kept in the readline history file between sessions
+_HISTORY_LENGTH = 1000
+
+# prompt_toolkit's FileHistory has its own file format, so it is kept apart from readline's
+_PROMPT_HISTORY_NAME = "prompt_history"
+
+# Upper bound for upload_albums --jobs; file uploads are divided between the albums
+_MAX_UPLOAD_JOBS = 4
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> "re.Pattern[str]":
+    """Compiled, case-insensitive form of a user pattern; repeated commands reuse it."""
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _checked_pattern(pattern: str) -> "Optional[re.Pattern[str]]":
+    """_compile_pattern, printing a message and returning None for an invalid regex."""
+    try:
+        return _compile_pattern(pattern)
+    except re.error as e:
+        print(f"Invalid pattern '{pattern}': {e}")
+        return None
+
+
+def _split_args(args: str) -> List[str]:
+    """Split a command line like a shell would for quotes, but keep backslashes literal.
+
+    Quoted values stay one token ("Trip Album"), while regexes such as IMG_.*\\.jpg and
+    Windows paths reach the command unchanged. Raises ValueError on an unclosed quote.
+    """
+    lexer = shlex.shlex(args, posix=True)
+    lexer.whitespace_split = True
+    lexer.escape = ""
+    return list(lexer)
+
+
+def _prompt_history():
+    """FileHistory in the config directory for the prompt_toolkit session (in memory if unwritable)."""
+    history_file = _default_config_dir() / _PROMPT_HISTORY_NAME
+    try:
+        history_file.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None  # PromptSession falls back to an in-memory history
+    return FileHistory(str(history_file))
+
+
+class _ShellCompleter(Completer):
+    """prompt_toolkit completer that reuses the shell's complete_* methods."""
+
+    def __init__(self, shell: "GooglePhotosInteractiveShell") -> None:
+        self.shell = shell
+
+    def get_completions(self, document, complete_event):
+        line = document.text_before_cursor
+        stripped = line.lstrip()
+        word = line[line.rfind(" ") + 1 :]
+        if " " not in stripped:
+            candidates = self.shell.completenames(word, line, len(line) - len(word), len(line))
+        else:
+            completer = getattr(self.shell, "complete_" + stripped.split(None, 1)[0], None)
+            if completer is None:
+                return
+            # Candidates may be quoted already, so match without an opening quote typed by the user
+            text = word.lstrip('"')
+            candidates = completer(text, line, len(line) - len(text), len(line))
+        for candidate in candidates:
+            yield Completion(candidate, start_position=-len(word))
+
+
+class _ShellArgumentParser(argparse.ArgumentParser):
+    """ArgumentParser that reports errors as ValueError instead of exiting the shell."""
+
+    def error(self, message: str):
+        raise ValueError(message)
 
 
 class GooglePhotosInteractiveShell(cmd.Cmd):
@@ -30,13 +123,9 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
 
     def __init__(self, zip_directory: str):
         super().__init__()
-        # Eagerly build catalog to speed up subsequent commands (with progress bar)
-        self.explorer = GooglePhotosExplorer(
-            zip_directory,
-            preload_catalog=True,
-            catalog_progress_callback=lambda i, t: OutputFormatter.print_index_progress(i, t, "Indexing"),
-        )
-        print()  # newline after progress bar
+        # The explorer (and its catalog) is built on first use; see the explorer property
+        self._zip_directory = zip_directory
+        self._explorer_maybe = None
         self.formatter = OutputFormatter()
         self.config = ConfigManager()
         self.current_zip = None
@@ -45,20 +134,104 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         self.current_album = None
 
         # Enable tab completion
-        if "libedit" in readline.__doc__:
+        if _USING_LIBEDIT:
             readline.parse_and_bind("bind ^I rl_complete")
         else:
             readline.parse_and_bind("tab: complete")
 
-        # Cache for performance (album list still cached for quick UI lookups)
+        # Command name -> bound do_* method, so onecmd() skips cmd.Cmd's per-line getattr
+        self._dispatch = {name[3:]: getattr(self, name) for name in dir(type(self)) if name.startswith("do_")}
+
+        # Options shared by the upload_* commands, built once per shell
+        self._upload_parser = _ShellArgumentParser(add_help=False)
+        self._upload_parser.add_argument("target", nargs="?")  # albums or pattern
+        self._upload_parser.add_argument("--container", type=lambda v: self._clean_cli_value(v).lower())
+        self._upload_parser.add_argument("--prefix", type=self._clean_cli_value)
+        self._upload_parser.add_argument("-m", "--include-metadata", action="store_true")
+        self._upload_parser.add_argument("--thumbs", action="store_true")
+        self._upload_parser.add_argument("--thumbs-only", action="store_true")
+        # upload_albums alone takes --jobs; other commands reject it as unknown
+        self._upload_albums_parser = _ShellArgumentParser(add_help=False, parents=[self._upload_parser])
+        self._upload_albums_parser.add_argument("--jobs", type=int, default=1)  # albums uploaded at once
+
+        # Cache for performance (album list still cached for quick UI lookups); both
+        # come from one list_folders() scan per session, see _get_folders_data
         self._album_cache = None
+        self._folders_data = None
+        self._album_cache_loading = False
+        self._album_completions = None  # (sorted lowercase names, display names) for tab completion
+        self._completion_hint_shown = False
+        self._prompt_toolkit = False  # set while cmdloop reads input through prompt_toolkit
+        self._prompt_session = None  # built on first cmdloop; kept so Ctrl-C does not drop its history
         self._file_cache = {}
 
+    @property
+    def explorer(self) -> GooglePhotosExplorer:
+        """The explorer, built with its catalog (and a progress bar) the first time a command needs it.
+
+        Commands that never touch the zips (config, cache, clear, quit) use
+        _explorer_maybe instead, so they don't pay for indexing.
+        """
+        if self._explorer_maybe is None:
+            self._explorer_maybe = GooglePhotosExplorer(
+                self._zip_directory,
+                preload_catalog=True,
+                catalog_progress_callback=lambda i, t: OutputFormatter.print_index_progress(i, t, "Indexing"),
+                config=self.config,
+            )
+            print()  # newline after progress bar
+        return self._explorer_maybe
+
+    def _get_folders_data(self, progress_label: Optional[str] = None) -> Dict[str, Any]:
+        """The list_folders() result, scanned once and reused until 'cache clear'."""
+        if self._folders_data is None:
+            progress_callback = (
+                (lambda i, t: self.formatter.print_progress(i, t, progress_label)) if progress_label else None
+            )
+            self._album_cache_loading = True
+            try:
+                self._folders_data = self.explorer.list_folders(progress_callback=progress_callback)
+            finally:
+                self._album_cache_loading = False
+            self._album_cache = self._folders_data["album_folders"]
+            self._album_completions = None
+        return self._folders_data
+
+    def _get_album_cache(self, announce: bool = False) -> Dict[str, Any]:
+        """Album name -> folder stats, from the shared folder scan."""
+        if self._album_cache is None:
+            if self._album_cache_loading:
+                # Re-entered (e.g. a tab press) while the scan runs; don't start a second one
+                return {}
+            if announce:
+                print("Loading album information...")
+            self._get_folders_data()
+        return self._album_cache
+
     @staticmethod
     def _clean_cli_value(val: str) -> str:
         """Strip surrounding quotes and whitespace from a CLI token."""
         return val.strip().strip('"').strip("'")
 
+    def _parse_upload_args(
+        self, args: str, parser: Optional[argparse.ArgumentParser] = None
+    ) -> Optional[argparse.Namespace]:
+        """Parse upload_* options; prints the problem and returns None on bad input.
+
+        Quoted values stay one token, so "Trip Album" or --prefix "a b" work as typed.
+        Stray words are ignored, but an option the command does not take is an error.
+        """
+        try:
+            opts, unknown = (parser or self._upload_parser).parse_known_args(_split_args(args or ""))
+        except ValueError as e:
+            print(f"Invalid arguments: {e}")
+            return None
+        unknown_options = [token for token in unknown if token.startswith("-")]
+        if unknown_options:
+            print(f"Invalid arguments: unrecognized option(s): {' '.join(unknown_options)}")
+            return None
+        return opts
+
     def do_list(self, arg):
         """List all zip files.
         Usage: list"""
@@ -110,10 +283,13 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         if not pattern:
             print("Please provide a search pattern.")
             return
+        regex = _checked_pattern(pattern)
+        if regex is None:
+            return
 
         print(f"Searching for pattern: {pattern}")
         results = self.explorer.search_files(
-            pattern, progress_callback=lambda i, t: self.formatter.print_progress(i, t, "Searching")
+            regex, progress_callback=lambda i, t: self.formatter.print_progress(i, t, "Searching")
         )
         print()  # New line after progress
 
@@ -123,12 +299,12 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
     def do_folders(self, arg):
         """List all folders with file counts.
         Usage: folders"""
-        print("Scanning all zip files for folders and counting files...")
-        data = self.explorer.list_folders(
-            progress_callback=lambda i, t: self.formatter.print_progress(i, t, "Scanning")
-        )
-        self._album_cache = data["album_folders"]
-        self.formatter.print_folders(data)
+        cached = self._folders_data is not None
+        if not cached:
+            print("Scanning all zip files for folders and counting files...")
+        self.formatter.print_folders(self._get_folders_data(progress_label="Scanning"))
+        if cached:
+            print("(cached; run 'cache clear' to rescan)")
 
     def do_albums(self, arg):
         """Alias for 'folders'.
@@ -147,10 +323,13 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
 
         pattern = parts[0]
         output_file = parts[1] if len(parts) > 1 else None
+        regex = _checked_pattern(pattern)
+        if regex is None:
+            return
 
         print(f"Extracting metadata for pattern: {pattern}")
         metadata = self.explorer.extract_metadata(
-            pattern, progress_callback=lambda i, t: self.formatter.print_progress(i, t, "Extracting")
+            regex, progress_callback=lambda i, t: self.formatter.print_progress(i, t, "Extracting")
         )
         print()  # New line after progress
 
@@ -206,15 +385,11 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         # Remove quotes if present
         album_name = album_name.strip('"')
 
-        # Load album cache if needed
-        if not self._album_cache:
-            print("Loading album information...")
-            data = self.explorer.list_folders()
-            self._album_cache = data["album_folders"]
+        album_cache = self._get_album_cache(announce=True)
 
-        if album_name in self._album_cache:
+        if album_name in album_cache:
             self.current_album = album_name
-            stats = self._album_cache[album_name]
+            stats = album_cache[album_name]
             print(f"Changed to album: {album_name}")
             print(f"  Images: {stats['images']}, Videos: {stats['videos']}")
             self.prompt = f"gphoto [{album_name}]> "
@@ -235,39 +410,23 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
             print("At root level. Use 'ls' to list zip files or 'folders' to view albums.")
             return
 
-        # Collect direct media files in the album folder
         album_name = self.current_album
-        image_exts = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".heic"}
-        video_exts = {".mp4", ".mov", ".avi", ".wmv", ".m4v", ".mpg", ".mpeg"}
-        media_exts = image_exts.union(video_exts)
-
-        # Direct contents in album folder
-        direct = self.explorer.get_album_contents(album_name)
-        direct_media = []
-        direct_metadata = []
-        for zip_name, file_path in direct:
-            ext = Path(file_path).suffix.lower()
-            if ext in media_exts:
-                direct_media.append((zip_name, file_path))
-            elif file_path.endswith(".json"):
-                direct_metadata.append((zip_name, file_path))
-
-        # Referenced photos resolved from metadata
-        resolved = self.explorer.resolve_album_photos(album_name)
-        referenced_media = []
-        for zip_path, file_path in resolved["photos"]:
-            referenced_media.append((zip_path.name, file_path))
-
-        # Combine and deduplicate media
-        seen = set()
-        all_media = []
-        for pair in direct_media + referenced_media:
-            if pair not in seen:
-                seen.add(pair)
-                all_media.append(pair)
-
-        # Optionally include metadata files present in the album folder
-        metadata_files = direct_metadata if include_metadata else None
+
+        # One ordered dict collects direct media, then referenced photos resolved from
+        # metadata; keys dedupe while keeping the first occurrence's position
+        media: Dict[tuple, None] = {}
+        metadata_files = [] if include_metadata else None
+        for zip_name, file_path in self.explorer.get_album_contents(album_name):
+            # Path(file_path).suffix.lower() without building a Path per entry
+            base = file_path[file_path.rfind("/") + 1 :]
+            dot = base.rfind(".")
+            if 0 < dot < len(base) - 1 and base[dot:].lower() in MEDIA_EXTS:
+                media[(zip_name, file_path)] = None
+            elif metadata_files is not None and file_path.endswith(".json"):
+                metadata_files.append((zip_name, file_path))
+        for zip_path, file_path in self.explorer.resolve_album_photos(album_name)["photos"]:
+            media[(zip_path.name, file_path)] = None
+        all_media = list(media)
 
         self.formatter.print_album_files(album_name, all_media, metadata_files)
 
@@ -285,10 +444,11 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
             return
         if parts[0] == "azure":
             if len(parts) == 2 and parts[1] == "show":
+                vals = self.config.azure_dict()
                 print("Azure configuration:")
-                print(f"  Connection string: {'set' if self.config.get_azure_connection_string() else 'not set'}")
-                print(f"  Container: {self.config.get_azure_container() or '(not set)'}")
-                print(f"  Default prefix: {self.config.get_azure_default_prefix() or '(empty)'}")
+                print(f"  Connection string: {'set' if vals['conn'] else 'not set'}")
+                print(f"  Container: {vals['container'] or '(not set)'}")
+                print(f"  Default prefix: {vals['prefix'] or '(empty)'}")
                 return
             if len(parts) >= 4 and parts[1] == "set":
                 key = parts[2]
@@ -311,42 +471,20 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         """Upload one or more albums to Azure storage.
         Usage:
           upload_albums [album1,album2,...] [--container NAME] [--prefix PFX] [-m] [--thumbs] [--thumbs-only]
+                        [--jobs N]
         If no albums are specified, interactive album selection is shown.
         Flags:
           -m / --include-metadata  Include JSON metadata files
           --thumbs                 Also upload thumbnails (prefixed 'thumb-')
           --thumbs-only            Upload only thumbnails (skip originals)
+          --jobs N                 Upload up to N albums at a time (at most 4). The parallel
+                                   file uploads are shared between them, not multiplied, and
+                                   per-file progress is not shown.
         """
-        # Parse flags
-        include_metadata = False
-        container = None
-        prefix = None
-        include_thumbnails = False
-        thumbnails_only = False
-        tokens = args.split() if args else []
-        albums_arg = None
-        i = 0
-        while i < len(tokens):
-            tok = tokens[i]
-            if tok in {"-m", "--include-metadata"}:
-                include_metadata = True
-                i += 1
-            elif tok == "--thumbs":
-                include_thumbnails = True
-                i += 1
-            elif tok == "--thumbs-only":
-                thumbnails_only = True
-                include_thumbnails = True
-                i += 1
-            elif tok == "--container" and i + 1 < len(tokens):
-                container = self._clean_cli_value(tokens[i + 1]).lower()
-                i += 2
-            elif tok == "--prefix" and i + 1 < len(tokens):
-                prefix = self._clean_cli_value(tokens[i + 1])
-                i += 2
-            else:
-                albums_arg = tok
-                i += 1
+        opts = self._parse_upload_args(args, self._upload_albums_parser)
+        if opts is None:
+            return
+        albums_arg = opts.target
 
         # Determine album list
         album_names: List[str] = []
@@ -363,28 +501,69 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
 
         print("\nStarting upload...")
 
-        def album_progress(current, total, album_name):
-            print(f"\n[{current}/{total}] Uploading album: {album_name}")
-
-        def file_progress(current, total, album_name):
-            percent = (current / total * 100) if total > 0 else 0
-            bar_length = 40
-            filled = int(bar_length * current / total) if total > 0 else 0
-            bar = "█" * filled + "░" * (bar_length - filled)
-            print(f"\r  {bar} {percent:.1f}% ({current}/{total} files)", end="", flush=True)
-
-        target = UploadTarget(provider="azure", container=container, prefix=(prefix or ""))
-        stats = self.explorer.upload_albums(
-            album_names,
-            target=target,
-            include_metadata=include_metadata,
-            include_thumbnails=include_thumbnails,
-            thumbnails_only=thumbnails_only,
-            progress_callback=album_progress,
-            file_progress_callback=file_progress,
-        )
+        target = UploadTarget(provider="azure", container=opts.container, prefix=(opts.prefix or ""))
+        upload_kwargs = {
+            "target": target,
+            "include_metadata": opts.include_metadata,
+            "include_thumbnails": opts.thumbs or opts.thumbs_only,
+            "thumbnails_only": opts.thumbs_only,
+        }
+        jobs = max(1, min(opts.jobs, _MAX_UPLOAD_JOBS, len(album_names)))
+        if opts.jobs > _MAX_UPLOAD_JOBS:
+            print(f"Note: --jobs is capped at {_MAX_UPLOAD_JOBS}.")
+        if jobs > 1:
+            # Split the per-call file workers between albums so the total in flight (and
+            # the provider's connection pool use) stays what one album at a time would use
+            target.concurrency = max(1, UPLOAD_CONCURRENCY // jobs)
+            stats = self._upload_albums_parallel(album_names, jobs, upload_kwargs)
+        else:
+
+            def album_progress(current, total, album_name):
+                print(f"\n[{current}/{total}] Uploading album: {album_name}")
+
+            stats = self.explorer.upload_albums(
+                album_names,
+                progress_callback=album_progress,
+                file_progress_callback=file_progress_bar(),
+                **upload_kwargs,
+            )
         self.formatter.print_upload_stats(stats)
 
+    def _upload_albums_parallel(
+        self, album_names: List[str], jobs: int, upload_kwargs: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Upload albums jobs at a time, one upload_albums() call each, and merge their stats.
+
+        Concurrent per-file bars would overwrite each other on the same line, so only
+        album start lines are printed.
+        """
+        explorer = self.explorer  # build the explorer and catalog before the threads start
+        print_lock = threading.Lock()
+        started = [0]
+
+        def upload_one(album_name: str) -> Dict[str, Any]:
+            with print_lock:
+                started[0] += 1
+                print(f"\n[{started[0]}/{len(album_names)}] Uploading album: {album_name}")
+            return explorer.upload_albums([album_name], **upload_kwargs)
+
+        stats: Dict[str, Any] = {
+            "albums_uploaded": 0,
+            "files_uploaded": 0,
+            "errors": 0,
+            "skipped": 0,
+            "album_details": {},
+            "error_details": [],
+        }
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            # map() yields in album order, so details merge as a sequential run would
+            for part in pool.map(upload_one, album_names):
+                for key in ("albums_uploaded", "files_uploaded", "errors", "skipped"):
+                    stats[key] += part[key]
+                stats["album_details"].update(part["album_details"])
+                stats["error_details"].extend(part["error_details"][: 50 - len(stats["error_details"])])
+        return stats
+
     def do_upload_results(self, args):
         """Upload files from the last search results to Azure storage.
         Usage: upload_results [--container NAME] [--prefix PFX] [-m] [--thumbs] [--thumbs-only]
@@ -392,50 +571,21 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         if not self.last_search_results:
             print("No search results available. Run 'search' first.")
             return
-        include_metadata = False
-        container = None
-        prefix = None
-        include_thumbnails = False
-        thumbnails_only = False
-        tokens = args.split() if args else []
-        i = 0
-        while i < len(tokens):
-            tok = tokens[i]
-            if tok in {"-m", "--include-metadata"}:
-                include_metadata = True
-                i += 1
-            elif tok == "--thumbs":
-                include_thumbnails = True
-                i += 1
-            elif tok == "--thumbs-only":
-                thumbnails_only = True
-                include_thumbnails = True
-                i += 1
-            elif tok == "--container" and i + 1 < len(tokens):
-                container = self._clean_cli_value(tokens[i + 1]).lower()
-                i += 2
-            elif tok == "--prefix" and i + 1 < len(tokens):
-                prefix = self._clean_cli_value(tokens[i + 1])
-                i += 2
-            else:
-                i += 1
+        opts = self._parse_upload_args(args)
+        if opts is None:
+            return
 
         print("\nStarting upload from results...")
 
-        def file_progress(current, total, item_name):
-            percent = (current / total * 100) if total > 0 else 0
-            bar_length = 40
-            filled = int(bar_length * current / total) if total > 0 else 0
-            bar = "█" * filled + "░" * (bar_length - filled)
-            print(f"\r  {bar} {percent:.1f}% ({current}/{total} files)", end="", flush=True)
+        file_progress = file_progress_bar()
 
-        target = UploadTarget(provider="azure", container=container, prefix=(prefix or ""))
+        target = UploadTarget(provider="azure", container=opts.container, prefix=(opts.prefix or ""))
         stats = self.explorer.upload_from_results(
             self.last_search_results,
             target=target,
-            include_metadata=include_metadata,
-            include_thumbnails=include_thumbnails,
-            thumbnails_only=thumbnails_only,
+            include_metadata=opts.include_metadata,
+            include_thumbnails=opts.thumbs or opts.thumbs_only,
+            thumbnails_only=opts.thumbs_only,
             file_progress_callback=lambda c, t, fn: file_progress(c, t, fn),
         )
         print()
@@ -448,54 +598,30 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         if not args:
             print("Usage: upload_pattern <PATTERN> [--container NAME] [--prefix PFX] [-m]")
             return
-        tokens = args.split()
-        pattern = tokens[0]
-        include_metadata = False
-        container = None
-        prefix = None
-        include_thumbnails = False
-        thumbnails_only = False
-        i = 1
-        while i < len(tokens):
-            tok = tokens[i]
-            if tok in {"-m", "--include-metadata"}:
-                include_metadata = True
-                i += 1
-            elif tok == "--thumbs":
-                include_thumbnails = True
-                i += 1
-            elif tok == "--thumbs-only":
-                thumbnails_only = True
-                include_thumbnails = True
-                i += 1
-            elif tok == "--container" and i + 1 < len(tokens):
-                container = self._clean_cli_value(tokens[i + 1]).lower()
-                i += 2
-            elif tok == "--prefix" and i + 1 < len(tokens):
-                prefix = self._clean_cli_value(tokens[i + 1])
-                i += 2
-            else:
-                i += 1
+        opts = self._parse_upload_args(args)
+        if opts is None:
+            return
+        if not opts.target:
+            print("Usage: upload_pattern <PATTERN> [--container NAME] [--prefix PFX] [-m]")
+            return
+        regex = _checked_pattern(opts.target)
+        if regex is None:
+            return
 
         print("\nScanning and uploading...")
 
         def progress_callback(i, t):
             self.formatter.print_progress(i, t, "Scanning")
 
-        def file_progress(current, total, item_name):
-            percent = (current / total * 100) if total > 0 else 0
-            bar_length = 40
-            filled = int(bar_length * current / total) if total > 0 else 0
-            bar = "█" * filled + "░" * (bar_length - filled)
-            print(f"\r  {bar} {percent:.1f}% ({current}/{total} files)", end="", flush=True)
+        file_progress = file_progress_bar()
 
-        target = UploadTarget(provider="azure", container=container, prefix=(prefix or ""))
+        target = UploadTarget(provider="azure", container=opts.container, prefix=(opts.prefix or ""))
         stats = self.explorer.upload_by_pattern(
-            pattern,
+            regex,
             target=target,
-            include_metadata=include_metadata,
-            include_thumbnails=include_thumbnails,
-            thumbnails_only=thumbnails_only,
+            include_metadata=opts.include_metadata,
+            include_thumbnails=opts.thumbs or opts.thumbs_only,
+            thumbnails_only=opts.thumbs_only,
             progress_callback=progress_callback,
             file_progress_callback=lambda c, t, _: file_progress(c, t, ""),
         )
@@ -507,18 +633,34 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         Usage: clear"""
         import os
 
-        os.system("clear" if os.name == "posix" else "cls")
+        # Legacy Windows consoles without ANSICON cannot interpret escape sequences
+        if os.name == "nt" and not os.environ.get("ANSICON"):
+            os.system("cls")
+            return
+        # Erase the display and home the cursor directly; no shell or clear(1) fork
+        sys.stdout.write("\x1b[2J\x1b[H")
+        sys.stdout.flush()
 
     def do_cache(self, arg):
         """Manage cache.
-        Usage: cache clear - Clear all cached data
+        Usage: cache clear - Clear all cached data, including the saved catalog
                cache info  - Show cache information"""
         if arg == "clear":
             self._album_cache = None
+            self._folders_data = None
+            self._album_completions = None
             self._file_cache = {}
+            _compile_pattern.cache_clear()
+            # Also drops the on-disk catalog, so the next lookup re-reads every zip
+            if self._explorer_maybe is not None:
+                self._explorer_maybe.clear_catalog_cache()
+            else:
+                # Not indexed yet this session; a bare explorer only lists the zips
+                with GooglePhotosExplorer(self._zip_directory, config=self.config) as explorer:
+                    explorer.clear_catalog_cache()
             print("Cache cleared.")
         elif arg == "info":
-            album_cached = "Yes" if self._album_cache else "No"
+            album_cached = "Yes" if self._album_cache is not None else "No"
             file_cache_size = len(self._file_cache)
             print(f"Album cache loaded: {album_cached}")
             print(f"File cache entries: {file_cache_size}")
@@ -535,15 +677,13 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
             return
 
         if filename.endswith(".json") and self.last_metadata:
-            with open(filename, "w") as f:
-                json.dump(self.last_metadata, f, indent=2)
+            self.formatter.write_json(self.last_metadata, filename)
             print(f"Exported {len(self.last_metadata)} metadata entries to {filename}")
         elif self.last_search_results:
             with open(filename, "w") as f:
+                # One write per zip instead of one per match
                 for zip_name, matches in self.last_search_results.items():
-                    f.write(f"\n{zip_name}:\n")
-                    for match in matches:
-                        f.write(f"  {match}\n")
+                    f.write(f"\n{zip_name}:\n" + "".join(f"  {match}\n" for match in matches))
             print(f"Exported search results to {filename}")
         else:
             print("No results to export. Run a search or metadata extraction first.")
@@ -561,7 +701,12 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
           export_albums "Photos from 2023,Bali"   # Export multiple albums
           export_albums "Photos from 2023" /path/to/output
         """
-        parts = args.split(maxsplit=1) if args else []
+        try:
+            # Keeps a quoted album name with spaces together as one argument
+            parts = _split_args(args) if args else []
+        except ValueError as e:
+            print(f"Invalid arguments: {e}")
+            return
 
         # Parse arguments
         album_names = []
@@ -592,16 +737,12 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
                 print("No albums selected.")
                 return
 
-        # Ensure album cache is loaded
-        if not self._album_cache:
-            print("Loading album information...")
-            data = self.explorer.list_folders()
-            self._album_cache = data["album_folders"]
+        album_cache = self._get_album_cache(announce=True)
 
         # Validate album names
         valid_albums = []
         for album in album_names:
-            if album in self._album_cache:
+            if album in album_cache:
                 valid_albums.append(album)
             else:
                 print(f"Warning: Album '{album}' not found, skipping.")
@@ -613,7 +754,7 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         # Confirm export
         print(f"\nReady to export {len(valid_albums)} album(s) to: {output_dir}")
         for album in valid_albums:
-            stats = self._album_cache[album]
+            stats = album_cache[album]
             total_files = stats["images"] + stats["videos"]
             print(f"  - {album} ({total_files} files)")
 
@@ -628,12 +769,7 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         def album_progress(current, total, album_name):
             print(f"\n[{current}/{total}] Exporting album: {album_name}")
 
-        def file_progress(current, total, album_name):
-            percent = (current / total * 100) if total > 0 else 0
-            bar_length = 40
-            filled = int(bar_length * current / total) if total > 0 else 0
-            bar = "█" * filled + "░" * (bar_length - filled)
-            print(f"\r  {bar} {percent:.1f}% ({current}/{total} files)", end="", flush=True)
+        file_progress = file_progress_bar()
 
         stats = self.explorer.export_albums(
             valid_albums, output_dir, progress_callback=album_progress, file_progress_callback=file_progress
@@ -643,24 +779,20 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
 
     def _interactive_album_selection(self):
         """Interactive album selection interface."""
-        if not self._album_cache:
-            print("Loading album information...")
-            data = self.explorer.list_folders()
-            self._album_cache = data["album_folders"]
+        album_cache = self._get_album_cache(announce=True)
 
         # Sort albums by name
-        sorted_albums = sorted(self._album_cache.keys())
-
-        print("\nSelect albums to export (use numbers, ranges, or 'all'):")
-        print("-" * 60)
-
-        # Display albums with numbers
-        for i, album in enumerate(sorted_albums, 1):
-            stats = self._album_cache[album]
-            total = stats["images"] + stats["videos"]
-            print(f"{i:3d}. {album:<40} ({total:>5} files)")
+        sorted_albums = sorted(album_cache.keys())
 
-        print("\nExamples: 1,3,5 | 1-5 | 1-5,10,15-20 | all")
+        # Build the whole numbered listing and write it at once, not one print per album
+        lines = ["\nSelect albums to export (use numbers, ranges, or 'all'):", "-" * 60]
+        lines.extend(
+            f"{i:3d}. {album:<40} ({album_cache[album]['images'] + album_cache[album]['videos']:>5} files)"
+            for i, album in enumerate(sorted_albums, 1)
+        )
+        lines.append("\nExamples: 1,3,5 | 1-5 | 1-5,10,15-20 | all\n")
+        sys.stdout.write("\n".join(lines))
+        sys.stdout.flush()
         selection = input("Your selection: ").strip()
 
         if not selection:
@@ -680,9 +812,8 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
                     start, end = part.split("-")
                     start_idx = int(start.strip()) - 1
                     end_idx = int(end.strip()) - 1
-                    for idx in range(start_idx, end_idx + 1):
-                        if 0 <= idx < len(sorted_albums):
-                            selected_albums.append(sorted_albums[idx])
+                    # Clamped slice: out-of-range ends are ignored, as for single numbers
+                    selected_albums.extend(sorted_albums[max(0, start_idx) : max(0, end_idx + 1)])
                 else:
                     # Single number
                     idx = int(part) - 1
@@ -693,14 +824,7 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
             return []
 
         # Remove duplicates while preserving order
-        seen = set()
-        unique_albums = []
-        for album in selected_albums:
-            if album not in seen:
-                seen.add(album)
-                unique_albums.append(album)
-
-        return unique_albums
+        return list(dict.fromkeys(selected_albums))
 
     def do_info(self, arg):
         """Show information about the collection.
@@ -708,7 +832,7 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
         print(f"Zip directory: {self.explorer.zip_directory}")
         print(f"Total zip files: {len(self.explorer.zip_files)}")
 
-        total_size = sum(zf.stat().st_size for zf in self.explorer.zip_files)
+        total_size = self.explorer.total_zip_size()
         print(f"Total size: {total_size / (1024**3):.1f} GB")
 
         if self.current_zip:
@@ -734,7 +858,10 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
 
     def complete_explore(self, text, line, begidx, endidx):
         """Tab completion for explore command."""
-        return [str(i) for i in range(1, len(self.explorer.zip_files) + 1) if str(i).startswith(text)]
+        if self._explorer_maybe is None:
+            # Completing must not trigger the catalog build behind the explorer property
+            return []
+        return [str(i) for i in range(1, len(self._explorer_maybe.zip_files) + 1) if str(i).startswith(text)]
 
     def complete_extract(self, text, line, begidx, endidx):
         """Tab completion for extract command."""
@@ -743,41 +870,103 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
             return self.complete_explore(text, line, begidx, endidx)
         return []
 
+    def _complete_album_names(self, text: str) -> List[str]:
+        """Album names starting with text (case-insensitive), quoted when they contain spaces.
+
+        Never scans the zips: until 'folders' (or a command that needs albums) has
+        loaded the album list, completion offers nothing and prints a one-time hint.
+        """
+        if self._album_cache is None:
+            if not self._completion_hint_shown and not self._prompt_toolkit:
+                # Under prompt_toolkit this may run on a completion thread; don't print there
+                self._completion_hint_shown = True
+                print(
+                    "\n(album names complete after running 'folders')\n" + self.prompt + readline.get_line_buffer(),
+                    end="",
+                    flush=True,
+                )
+            return []
+        if self._album_completions is None:
+            # Sorted by lowercase name so a prefix is a contiguous run found by bisect
+            entries = sorted((name.lower(), f'"{name}"' if " " in name else name) for name in self._album_cache)
+            self._album_completions = ([key for key, _ in entries], [shown for _, shown in entries])
+        keys, shown = self._album_completions
+        prefix = text.lower()
+        start = bisect.bisect_left(keys, prefix)
+        end = start
+        while end < len(keys) and keys[end].startswith(prefix):
+            end += 1
+        return shown[start:end]
+
     def complete_cd(self, text, line, begidx, endidx):
         """Tab completion for cd command."""
-        if not self._album_cache:
-            # Load albums if not cached
-            data = self.explorer.list_folders()
-            self._album_cache = data["album_folders"]
-
-        # Return matching album names
-        albums = [
-            f'"{name}"' if " " in name else name
-            for name in self._album_cache.keys()
-            if name.lower().startswith(text.lower())
-        ]
-        return albums
+        return self._complete_album_names(text)
 
     def complete_export_albums(self, text, line, begidx, endidx):
         """Tab completion for export_albums command."""
-        if not self._album_cache:
-            # Load albums if not cached
-            data = self.explorer.list_folders()
-            self._album_cache = data["album_folders"]
-
-        # Return matching album names
-        albums = [
-            f'"{name}"' if " " in name else name
-            for name in self._album_cache.keys()
-            if name.lower().startswith(text.lower())
-        ]
-        return albums
+        return self._complete_album_names(text)
+
+    def complete_upload_albums(self, text, line, begidx, endidx):
+        """Tab completion for upload_albums command."""
+        return self._complete_album_names(text)
 
     def complete_cache(self, text, line, begidx, endidx):
         """Tab completion for cache command."""
         commands = ["clear", "info"]
         return [cmd for cmd in commands if cmd.startswith(text)]
 
+    def cmdloop(self, intro=None):
+        """Read commands with prompt_toolkit when it is installed and stdin is a terminal.
+
+        Completions come from a ThreadedCompleter, so a slow completer never freezes
+        typing. The session is built once, with a FileHistory in the config directory,
+        so history survives Ctrl-C and later sessions. Without prompt_toolkit (or for
+        piped input) cmd.Cmd's readline loop is used.
+        """
+        if PromptSession is None or not sys.stdin.isatty():
+            return super().cmdloop(intro)
+        self.preloop()
+        if intro is not None:
+            self.intro = intro
+        if self.intro:
+            self.stdout.write(str(self.intro) + "\n")
+        if self._prompt_session is None:
+            self._prompt_session = PromptSession(
+                completer=ThreadedCompleter(_ShellCompleter(self)),
+                complete_while_typing=False,
+                history=_prompt_history(),
+            )
+        session = self._prompt_session
+        self._prompt_toolkit = True
+        try:
+            stop = None
+            while not stop:
+                try:
+                    line = session.prompt(self.prompt)
+                except EOFError:
+                    line = "EOF"
+                line = self.precmd(line)
+                stop = self.onecmd(line)
+                stop = self.postcmd(stop, line)
+        finally:
+            self._prompt_toolkit = False
+        self.postloop()
+
+    def onecmd(self, line):
+        """Run one command line, looking the command up in a table built at startup.
+
+        "name args" lines go straight to the do_* method; anything else ('?', '!',
+        names glued to punctuation, unknown commands) takes cmd.Cmd's generic path.
+        """
+        parts = line.split(None, 1)
+        if not parts:
+            return self.emptyline()
+        handler = self._dispatch.get(parts[0])
+        if handler is None:
+            return super().onecmd(line)
+        self.lastcmd = "" if parts[0] == "EOF" else line.strip()
+        return handler(parts[1].strip() if len(parts) > 1 else "")
+
     def emptyline(self):
         """Do nothing on empty line."""
         pass
@@ -790,12 +979,34 @@ class GooglePhotosInteractiveShell(cmd.Cmd):
 
 def run_interactive(zip_directory: str):
     """Run the interactive shell."""
+    shell = None
+    history_file = _default_config_dir() / "history"
+    try:
+        readline.read_history_file(history_file)
+    except OSError:
+        pass  # first session, or an unreadable file; start with an empty history
+    readline.set_history_length(_HISTORY_LENGTH)
     try:
         shell = GooglePhotosInteractiveShell(zip_directory)
-        shell.cmdloop()
-    except KeyboardInterrupt:
-        print("\nUse 'quit' to exit.")
-        run_interactive(zip_directory)
+        intro = None
+        while True:
+            # Ctrl-C drops back into the same shell, so caches and the indexed
+            # catalog survive and the stack does not grow with each interrupt
+            try:
+                shell.cmdloop(intro)
+                break
+            except KeyboardInterrupt:
+                print("\nUse 'quit' to exit.")
+                intro = ""  # don't repeat the banner
     except Exception as e:
         print(f"Error: {e}")
         sys.exit(1)
+    finally:
+        # Release the cached zip handles
+        if shell is not None and shell._explorer_maybe is not None:
+            shell._explorer_maybe.close()
+        try:
+            history_file.parent.mkdir(parents=True, exist_ok=True)
+            readline.write_history_file(history_file)
+        except OSError:
+            pass  # history is a convenience; never fail the exit over it
@@ -0,0 +1,80 @@
+"""Tests for core.config.ConfigManager."""
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from core.config import ConfigManager
+
+
+class ConfigMergeTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.config_dir = Path(self._tmp.name)
+        self.config_file = self.config_dir / "config.json"
+        # Environment overrides would hide what is stored on disk
+        env = {k: v for k, v in os.environ.items() if not k.startswith("AZURE_STORAGE_")}
+        patcher = mock.patch.dict(os.environ, env, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self._tmp.cleanup)
+
+    def _write(self, data):
+        self.config_file.write_text(json.dumps(data))
+
+    def _read(self):
+        return json.loads(self.config_file.read_text())
+
+    def test_set_survives_non_dict_parent_on_disk(self):
+        for on_disk in ({"azure": {}}, {"azure": None}, {"azure": "x"}):
+            for preload in (True, False):
+                with self.subTest(on_disk=on_disk, preload=preload):
+                    self._write(on_disk)
+                    config = ConfigManager(self.config_dir)
+                    if preload:
+                        config.load()
+                    config.set_azure_container("new")
+                    self.assertEqual(self._read()["azure"]["container"], "new")
+                    self.assertEqual(ConfigManager(self.config_dir).get_azure_container(), "new")
+
+    def test_subtree_below_known_leaf_does_not_break_save(self):
+        self._write({"azure": {"container": {"nested": 1}}})
+        config = ConfigManager(self.config_dir)
+        config.load()
+        config.set_azure_default_prefix("backups")
+        saved = self._read()["azure"]
+        self.assertEqual(saved["container"], {"nested": 1})
+        self.assertEqual(saved["default_prefix"], "backups")
+
+    def test_unrelated_keys_are_preserved(self):
+        self._write({"other": {"key": 1}, "azure": {"container": "old"}})
+        config = ConfigManager(self.config_dir)
+        config.set_azure_container("new")
+        saved = self._read()
+        self.assertEqual(saved["other"], {"key": 1})
+        self.assertEqual(saved["azure"]["container"], "new")
+
+    def test_keys_containing_dots_round_trip(self):
+        self._write({"ui": {"a.b": 1, "c": {"d.e": [2]}}, "azure": {"container": "old"}})
+        config = ConfigManager(self.config_dir)
+        config.set_azure_container("new")
+        saved = self._read()
+        self.assertEqual(saved["ui"], {"a.b": 1, "c": {"d.e": [2]}})
+        self.assertEqual(ConfigManager(self.config_dir).get("ui", "a.b"), 1)
+
+    def test_wrongly_typed_value_is_ignored_but_kept(self):
+        self._write({"azure": {"container": 5, "connection_string": "conn"}})
+        config = ConfigManager(self.config_dir)
+        self.assertIsNone(config.get_azure_container())
+        config.set_azure_default_prefix("backups")
+        saved = self._read()["azure"]
+        self.assertEqual(saved["container"], 5)
+        self.assertEqual(saved["connection_string"], "conn")
+        self.assertEqual(saved["default_prefix"], "backups")
+
+
+if __name__ == "__main__":
+    unittest.main()